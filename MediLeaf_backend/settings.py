@@ -30,6 +30,7 @@ DEFAULT_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 # These are the third party apps that we are using in our project.
@@ -94,6 +95,55 @@ DATABASES = {
     }
 }
 
+# Cache configuration
+# Cached responses are invalidated from model signals of the process that made the change,
+# so every process must share the backend in production (e.g. filecache or memcached).
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=60 * 60)
+
+# Minimum pg_trgm word similarity of the fuzzy plant name search, between 0 and 1.
+FUZZY_SEARCH_THRESHOLD = env.float('FUZZY_SEARCH_THRESHOLD', default=0.3)
+
+# Where plant observations are buffered before being written: 'local', 'cache' or 'auto',
+# which picks the cache when it is shared between processes (Redis or Memcached).
+OBSERVATION_BUFFER = env.str('OBSERVATION_BUFFER', default='auto')
+OBSERVATION_FLUSH_INTERVAL = env.int('OBSERVATION_FLUSH_INTERVAL', default=30)
+
+# Directory of the offline catalog bundle, rebuilt on download after catalog changes.
+CATALOG_BUNDLE_ROOT = env.str('CATALOG_BUNDLE_ROOT', default=os.path.join(BASE_DIR, 'bundles'))
+# Seconds a superseded bundle is kept, so that downloads which read its metadata before
+# the rebuild can still open it.
+CATALOG_BUNDLE_GRACE_PERIOD = env.int('CATALOG_BUNDLE_GRACE_PERIOD', default=600)
+# Age in seconds a catalog change must reach before delta syncs return it, leaving the
+# changes logged concurrently the time to become visible.
+CATALOG_SYNC_DELAY = env.int('CATALOG_SYNC_DELAY', default=5)
+# Days the catalog changes are kept by prune_catalog_changes; clients that did not sync
+# for longer have to download the bundle again.
+CATALOG_CHANGES_RETENTION_DAYS = env.int('CATALOG_CHANGES_RETENTION_DAYS', default=30)
+
+# Maximum number of differing bits between the perceptual hashes of two images taken for
+# copies of one another, and whether uploading a copy of a plant or feedback image fails.
+IMAGE_DUPLICATE_DISTANCE = env.int('IMAGE_DUPLICATE_DISTANCE', default=6)
+REJECT_DUPLICATE_IMAGES = env.bool('REJECT_DUPLICATE_IMAGES', default=False)
+
+# Uploads are aborted as soon as a file crosses the limit of its form field, in bytes.
+# Requests larger than FILE_UPLOAD_MAX_MEMORY_SIZE spool their files to disk, which bounds
+# the memory taken by each upload request.
+FILE_UPLOAD_HANDLERS = [
+    'utilities.upload_handlers.SizeLimitUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+FILE_UPLOAD_FIELD_MAX_SIZES = {
+    'image': 1000 * 1024,
+    'avatar': 4000 * 1024,
+}
+FILE_UPLOAD_DEFAULT_MAX_SIZE = env.int('FILE_UPLOAD_DEFAULT_MAX_SIZE', default=4000 * 1024)
+FILE_UPLOAD_MAX_MEMORY_SIZE = env.int('FILE_UPLOAD_MAX_MEMORY_SIZE', default=1024 * 1024)
+DATA_UPLOAD_MAX_NUMBER_FILES = 10
+
 # Email configuration
 
 EMAIL_USE_TLS = True
@@ -128,6 +178,12 @@ AUTH_PASSWORD_VALIDATORS = [
 
 LANGUAGE_CODE = 'en-us'
 
+# Languages of the bilingual plant content, negotiated with `?lang=` or Accept-Language.
+LANGUAGES = [
+    ('en', 'English'),
+    ('ne', 'Nepali'),
+]
+
 TIME_ZONE = 'UTC'
 
 USE_I18N = True
@@ -286,10 +342,16 @@ SITE_DOMAIN = env('SITE_DOMAIN')
 # DRF global settings
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'utilities.renderers.FastJSONRenderer',
+        'utilities.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
-        'rest_framework.parsers.JSONParser'
+        'utilities.parsers.FastJSONParser',
+        'utilities.parsers.MessagePackParser'
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -309,7 +371,8 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '5/min',
-        'user': '8/min'
+        'user': '8/min',
+        'autocomplete': '120/min'
     }
 }
 
@@ -369,7 +432,10 @@ CSRF_TRUSTED_ORIGINS = ["http://localhost:3000"]
 # Whitenoise
 STORAGES = {
     "default": {
-        "BACKEND": "cloudinary_storage.storage.MediaCloudinaryStorage",
+        # FileSystemStorage (django.core.files.storage.FileSystemStorage) serves uploads
+        # from MEDIA_ROOT for local development.
+        "BACKEND": env.str('MEDIA_STORAGE_BACKEND',
+                           default="cloudinary_storage.storage.MediaCloudinaryStorage"),
     },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact_us', '0006_remove_feedback_common_names_feedback_common_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactus',
+            index=models.Index(fields=['created_at', 'id'], name='contact_us__created_6e6e68_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactus',
+            index=models.Index(fields=['updated_at', 'id'], name='contact_us__updated_182b5a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['created_at', 'id'], name='contact_us__created_16bc94_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['updated_at', 'id'], name='contact_us__updated_5423e8_idx'),
+        ),
+    ]
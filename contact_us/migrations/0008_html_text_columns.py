@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:29
+
+from django.db import migrations, models
+
+from utilities.html import clean_html, make_excerpt
+
+
+HTML_FIELDS = {
+    'ContactUs': {'message': ('message_text', 'message_excerpt')},
+    'Feedback': {
+        'description': ('description_text', 'description_excerpt'),
+        'medicinal_properties': ('medicinal_properties_text', 'medicinal_properties_excerpt'),
+    },
+}
+
+
+def populate_text_columns(apps, schema_editor):
+    for model_name, fields in HTML_FIELDS.items():
+        model = apps.get_model('contact_us', model_name)
+        instances = list(model.objects.only(*fields).order_by('id'))
+        for instance in instances:
+            for name, (text_name, excerpt_name) in fields.items():
+                _, text = clean_html(getattr(instance, name))
+                setattr(instance, text_name, text)
+                setattr(instance, excerpt_name, make_excerpt(text))
+        model.objects.bulk_update(instances, [column for columns in fields.values()
+                                              for column in columns], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact_us', '0007_contactus_contact_us__created_6e6e68_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactus',
+            name='message_excerpt',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='contactus',
+            name='message_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='description_excerpt',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='description_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='medicinal_properties_excerpt',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='medicinal_properties_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(populate_text_columns,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:36
+
+import contact_us.models
+from django.db import migrations, models
+import utilities.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact_us', '0009_image_details'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='image_hash',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='feedback',
+            name='image',
+            field=models.ImageField(upload_to=contact_us.models.get_upload_to, validators=[utilities.validators.ImageValidator(size=1024000), utilities.validators.UniqueImageValidator()]),
+        ),
+    ]
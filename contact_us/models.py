@@ -7,22 +7,30 @@ from django.template.defaultfilters import slugify
 from django_ckeditor_5.fields import CKEditor5Field
 from django.core.exceptions import ValidationError
 from django.utils.safestring import mark_safe
-from utilities.models import TimeStamp
-from utilities.validators import ImageValidator
+from utilities.models import CleanHTMLMixin, ImageDetailsMixin, TimeStamp
+from utilities.validators import ImageValidator, UniqueImageValidator
 
 
-class ContactUs(TimeStamp):
+class ContactUs(CleanHTMLMixin, TimeStamp):
     first_name = models.CharField('first name', max_length=64)
     last_name = models.CharField('last name', max_length=64)
     email = models.EmailField('email address', unique=True)
     subject = models.CharField(
         'subject', max_length=255, null=True, blank=True, default=None)
     message = CKEditor5Field()
-   
+    message_text = models.TextField(default='', editable=False)
+    message_excerpt = models.CharField(max_length=255, default='', editable=False)
+
+    html_fields = {'message': ('message_text', 'message_excerpt')}
+
     class Meta:
         verbose_name = 'ContactUs'
         verbose_name_plural = 'ContactUs'
         ordering = ('-id',)
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
     def __str__(self):
         return f'{self.subject}'
@@ -42,7 +50,7 @@ def get_upload_to(instance, filename):
 
     return image_path
 
-class Feedback(TimeStamp):
+class Feedback(CleanHTMLMixin, ImageDetailsMixin, TimeStamp):
     Annual = 'annual'
     Biennial = 'biennial'
     Perennial = 'perennial'
@@ -77,6 +85,11 @@ class Feedback(TimeStamp):
     common_name = models.CharField(max_length=255)
     description = CKEditor5Field()
     medicinal_properties = CKEditor5Field()
+    # Plain text and excerpts of the rich text fields, written on save.
+    description_text = models.TextField(default='', editable=False)
+    description_excerpt = models.CharField(max_length=255, default='', editable=False)
+    medicinal_properties_text = models.TextField(default='', editable=False)
+    medicinal_properties_excerpt = models.CharField(max_length=255, default='', editable=False)
     duration = models.CharField(max_length=10, choices=Duration)
     growth_habit = models.CharField(max_length=10, choices=Growth)
 
@@ -86,17 +99,32 @@ class Feedback(TimeStamp):
         'species', max_length=255, null=True, blank=True, default=None)
     
     image = models.ImageField(upload_to=get_upload_to, validators=[
-        ImageValidator(size=1000*1024)])
-    
+        ImageValidator(size=1000*1024), UniqueImageValidator()])
+    # Written on upload, see `ImageDetailsMixin`.
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.CharField(max_length=64, blank=True, default='', editable=False)
+    image_color = models.CharField(max_length=7, blank=True, default='', editable=False)
+    image_hash = models.BigIntegerField(null=True, blank=True, editable=False, db_index=True)
+
     is_verified = models.BooleanField(default=False, verbose_name='Verified')
 
     user = models.ForeignKey(
         User, related_name='feedback', on_delete=models.CASCADE)
 
+    html_fields = {
+        'description': ('description_text', 'description_excerpt'),
+        'medicinal_properties': ('medicinal_properties_text', 'medicinal_properties_excerpt'),
+    }
+
     class Meta:
         verbose_name = 'Feedback'
         verbose_name_plural = 'Feedbacks'
         ordering = ('-id',)
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
     def get_scientific_name(self):
         if self.species is not None:
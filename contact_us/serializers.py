@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import ContactUs, Feedback
+from utilities.fast_serializers import ValuesSerializer, represent_datetime, represent_file
 
 
 class ContactUsSerializer(serializers.ModelSerializer):
@@ -27,8 +28,38 @@ class FeedbackListSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
 
     class Meta:
-        fields = ("id", "common_name", "family",
-                  "genus", "species", "image", "user", "created_at", "updated_at")
+        fields = ("id", "common_name", "description_excerpt", "family", "genus", "species",
+                  "image", "image_width", "image_height", "image_placeholder", "image_color",
+                  "user", "created_at", "updated_at")
         model = Feedback
-        read_only_fields = ("id", "common_name", "family", "genus",
-                            "species", "image", "user", "created_at", "updated_at")
+        read_only_fields = fields
+
+
+class FeedbackListValuesSerializer(ValuesSerializer):
+    """
+    `.values()` counterpart of `FeedbackListSerializer`, see `utilities.fast_serializers`.
+    """
+    fields = (
+        ("id", "id", None),
+        ("common_name", "common_name", None),
+        ("description_excerpt", "description_excerpt", None),
+        ("family", "family", None),
+        ("genus", "genus", None),
+        ("species", "species", None),
+        ("image", "image", "get_image"),
+        ("image_width", "image_width", None),
+        ("image_height", "image_height", None),
+        ("image_placeholder", "image_placeholder", None),
+        ("image_color", "image_color", None),
+        ("user", ("user__first_name", "user__last_name"), "get_user"),
+        ("created_at", "created_at", represent_datetime),
+        ("updated_at", "updated_at", represent_datetime),
+    )
+
+    def __init__(self, fields=None, context=None):
+        self.get_image = represent_file(Feedback._meta.get_field('image').storage,
+                                        (context or {}).get('request'))
+        super().__init__(fields, context)
+
+    def get_user(self, first_name, last_name):
+        return f'{first_name} {last_name}'.strip()
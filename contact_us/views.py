@@ -7,8 +7,10 @@ from django.views.decorators.csrf import csrf_protect
 
 
 from account.permissions import IsVerifiedUser
+from utilities.fast_serializers import ValuesListMixin
+from utilities.pagination import KeysetPagination
 from .models import ContactUs, Feedback
-from contact_us.serializers import ContactUsSerializer, FeedbackSerializer, FeedbackListSerializer, FeedbackUpdateSerializer
+from contact_us.serializers import ContactUsSerializer, FeedbackSerializer, FeedbackListSerializer, FeedbackUpdateSerializer, FeedbackListValuesSerializer
 
 
 @method_decorator(csrf_protect, name='dispatch')
@@ -17,6 +19,7 @@ class ContactUsViewSet(viewsets.ModelViewSet):
     queryset = ContactUs.objects.all()
     serializer_class = ContactUsSerializer
     permission_classes = (permissions.AllowAny, )
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter,
                        filters.OrderingFilter,]
 
@@ -27,10 +30,12 @@ class ContactUsViewSet(viewsets.ModelViewSet):
 
 @method_decorator(csrf_protect, name='dispatch')
 @extend_schema(summary='Feedback Viewset', tags=['Feedbacks'])
-class FeedbackViewset(viewsets.ModelViewSet):
+class FeedbackViewset(ValuesListMixin, viewsets.ModelViewSet):
     queryset = Feedback.objects.all()
     serializer_class = FeedbackUpdateSerializer
+    values_serializer_class = FeedbackListValuesSerializer
     permission_classes = (permissions.IsAuthenticated, IsVerifiedUser)
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter,
                        filters.OrderingFilter,]
 
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 
 from .models import Plant, PlantFamily, PlantGenus, PlantSpecies, PlantImage
+from utilities.duplicates import find_duplicate_groups
 
 
 class PlantImageInline(admin.StackedInline):
@@ -27,31 +31,33 @@ class PlantSpeciesAdmin(admin.ModelAdmin):
 class PlantGenusAdmin(admin.ModelAdmin):
     list_per_page = 10
     date_hierarchy = 'created_at'
-    list_display = ('id', 'title', 'slug', 'family',
+    list_display = ('id', 'title', 'slug', 'family', 'no_of_species',
                     'created_at', 'updated_at')
     list_display_links = (
         'id', 'title'
     )
     list_filter = ('created_at', 'updated_at')
     search_fields = ('title', 'family__title')
-    readonly_fields = ('created_at', 'updated_at', 'slug')
+    readonly_fields = ('created_at', 'updated_at', 'slug', 'no_of_species')
 
 
 @admin.register(PlantFamily)
 class PlantFamilyAdmin(admin.ModelAdmin):
     list_per_page = 10
     date_hierarchy = 'created_at'
-    list_display = ('id', 'title', 'slug', 'created_at', 'updated_at')
+    list_display = ('id', 'title', 'slug', 'no_of_plants',
+                    'created_at', 'updated_at')
     list_display_links = (
         'id', 'title'
     )
     list_filter = ('created_at', 'updated_at')
     search_fields = ('title', )
-    readonly_fields = ('created_at', 'updated_at', 'slug')
+    readonly_fields = ('created_at', 'updated_at', 'slug', 'no_of_plants')
 
 
 @admin.register(PlantImage)
 class PlantImageAdmin(admin.ModelAdmin):
+    change_list_template = 'admin/plant/plantimage/change_list.html'
     list_per_page = 10
     date_hierarchy = 'created_at'
     list_display = ('id', 'scientific_name', 'part', 'image_tag',
@@ -76,6 +82,39 @@ class PlantImageAdmin(admin.ModelAdmin):
         else:
             return f'{obj.plant.genus}'
 
+    def get_urls(self):
+        return [
+            path('duplicates/', self.admin_site.admin_view(self.duplicates_view),
+                 name='plant_plantimage_duplicates'),
+            *super().get_urls(),
+        ]
+
+    def duplicates_view(self, request):
+        """
+        List the groups of near identical plant and feedback images, as told by their
+        perceptual hashes, so that editors can delete the extra copies.
+        """
+        groups = find_duplicate_groups(settings.IMAGE_DUPLICATE_DISTANCE)
+        pks = {}
+        for group in groups:
+            for model, pk in group:
+                pks.setdefault(model, []).append(pk)
+        objects = {model: model.objects.in_bulk(model_pks) for model, model_pks in pks.items()}
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Duplicate images',
+            'max_distance': settings.IMAGE_DUPLICATE_DISTANCE,
+            'groups': [[{
+                'object': objects[model][pk],
+                'kind': model._meta.verbose_name,
+                'url': reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_change',
+                               args=[pk]),
+            } for model, pk in group if pk in objects[model]] for group in groups],
+        }
+        return TemplateResponse(request, 'admin/plant/plantimage/duplicates.html', context)
+
 
 @admin.register(Plant)
 class PlantAdmin(admin.ModelAdmin):
@@ -0,0 +1,153 @@
+import unicodedata
+from bisect import bisect_left, insort
+from threading import RLock
+
+from .models import PlantFamily, PlantGenus, PlantSpecies, Plant
+from utilities.cache import get_versions
+
+
+INDEXED_MODELS = (PlantFamily, PlantGenus, PlantSpecies, Plant)
+
+
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def get_keys(text):
+    """
+    Return the normalized `text` starting at each of its words, so that "bas" completes
+    "Holy Basil" as well as "Basella".
+    """
+    text = normalize(text)
+    keys = [text] if text else []
+    for position, char in enumerate(text):
+        if char == ' ':
+            keys.append(text[position + 1:])
+
+    return keys
+
+
+class PrefixIndex:
+    """
+    Sorted array of (key, kind, id, text, slug) items answering prefix queries with a
+    binary search. The index lives in the process memory; it is built on first use,
+    patched on catalog signals and rebuilt from scratch whenever another process changed
+    the catalog, as told by the response cache versions of the indexed models.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+        self.items = []
+        self.entities = {}
+        self.versions = None
+
+    def get_entries(self, kind, pks=None):
+        """
+        Return the (kind, id, text, slug) entries of the given `kind` of rows, or of
+        every row of that kind if `pks` is None.
+        """
+        if kind == 'plant':
+            queryset = Plant.objects.values_list('id', 'common_names', 'common_names_ne', 'slug')
+        elif kind == 'species':
+            queryset = PlantSpecies.objects.values_list('id', 'genus__title', 'title', 'slug')
+        else:
+            model = PlantFamily if kind == 'family' else PlantGenus
+            queryset = model.objects.values_list('id', 'title', 'slug')
+
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks)
+
+        entries = []
+        for row in queryset:
+            if kind == 'plant':
+                pk, common_names, common_names_ne, slug = row
+                entries.extend((kind, pk, name, slug)
+                               for name in (common_names or []) + (common_names_ne or []))
+            elif kind == 'species':
+                pk, genus, title, slug = row
+                entries.append((kind, pk, f'{genus} {title}'.strip(), slug))
+            else:
+                pk, title, slug = row
+                entries.append((kind, pk, title, slug))
+
+        return entries
+
+    def add(self, entries, sort=True):
+        for kind, pk, text, slug in entries:
+            items = [(key, kind, pk, text, slug) for key in get_keys(text)]
+            self.entities.setdefault((kind, pk), []).extend(items)
+            if sort:
+                for item in items:
+                    insort(self.items, item)
+            else:
+                self.items.extend(items)
+
+    def remove(self, kind, pk):
+        for item in self.entities.pop((kind, pk), []):
+            del self.items[bisect_left(self.items, item)]
+
+    def rebuild(self, versions):
+        self.items, self.entities = [], {}
+        for kind in ('family', 'genus', 'species', 'plant'):
+            self.add(self.get_entries(kind), sort=False)
+        self.items.sort()
+        self.versions = versions
+
+    def refresh(self, label, kind, pk, plant_ids=()):
+        """
+        Re-read the entries of a changed row, and of the species and plants named after a
+        changed genus or species, once the change bumped the version of `label`. The plants
+        detached from a deleted species are given as `plant_ids`. If any other change
+        slipped in meanwhile the index is left stale and gets rebuilt on next use.
+        """
+        with self.lock:
+            if self.versions is None:
+                return
+
+            stale = {kind: [pk]}
+            if kind == 'genus':
+                stale['species'] = list(PlantSpecies.objects.filter(
+                    genus_id=pk).values_list('pk', flat=True))
+            if kind in ('genus', 'species'):
+                # Their slugs derive from the scientific name.
+                stale['plant'] = [*Plant.objects.filter(**{f'{kind}_id': pk}).values_list(
+                    'pk', flat=True), *plant_ids]
+
+            for stale_kind, pks in stale.items():
+                for stale_pk in pks:
+                    self.remove(stale_kind, stale_pk)
+                self.add(self.get_entries(stale_kind, pks))
+
+            position = [model._meta.label for model in INDEXED_MODELS].index(label)
+            current = get_versions([label])[0]
+            if self.versions[position] + 1 == current:
+                self.versions[position] = current
+
+    def search(self, prefix, limit=10):
+        """
+        Return up to `limit` distinct suggestions whose text has a word starting with
+        `prefix`, in alphabetical order of the matched word.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        versions = get_versions([model._meta.label for model in INDEXED_MODELS])
+        with self.lock:
+            if versions != self.versions:
+                self.rebuild(versions)
+
+            suggestions = {}
+            position = bisect_left(self.items, (prefix,))
+            while len(suggestions) < limit and position < len(self.items):
+                key, kind, pk, text, slug = self.items[position]
+                if not key.startswith(prefix):
+                    break
+                suggestions.setdefault((kind, pk, text), {
+                    'kind': kind, 'id': pk, 'text': text, 'slug': slug})
+                position += 1
+
+        return list(suggestions.values())
+
+
+plant_names = PrefixIndex()
@@ -0,0 +1,187 @@
+import contextlib
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import PlantFamily, PlantGenus, PlantSpecies, Plant, PlantImage, CatalogChange
+from utilities.cache import get_versions
+from utilities.renderers import FastJSONRenderer
+
+
+# Version bumped by the catalog signals, telling that the bundle is stale.
+BUNDLE_DEPENDENCY = 'plant.CatalogBundle'
+METADATA_FILENAME = 'catalog.json'
+LOCK_FILENAME = 'catalog.lock'
+
+
+def get_bundle_path(filename):
+    return os.path.join(settings.CATALOG_BUNDLE_ROOT, filename)
+
+
+@contextlib.contextmanager
+def build_lock():
+    """
+    Serialize the builds of all the processes sharing the bundle directory. Each caller
+    locks its own descriptor, so threads of one process exclude each other as well.
+    """
+    os.makedirs(settings.CATALOG_BUNDLE_ROOT, exist_ok=True)
+    with open(get_bundle_path(LOCK_FILENAME), 'wb') as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        yield
+
+
+# Rows of each kind of the catalog, in the order clients apply them.
+CATALOG_KINDS = {
+    'families': PlantFamily,
+    'genuses': PlantGenus,
+    'species': PlantSpecies,
+    'plants': Plant,
+}
+
+CATALOG_FIELDS = {
+    'families': ('id', 'title', 'slug'),
+    'genuses': ('id', 'title', 'slug', 'family_id'),
+    'species': ('id', 'title', 'slug', 'genus_id'),
+    'plants': ('id', 'scientific_name', 'slug', 'common_names', 'common_names_ne',
+               'family_id', 'genus_id', 'species_id'),
+}
+
+
+def get_catalog(pks=None):
+    """
+    Return the whole catalog as plain data: the taxonomy, and the plants with the URL of
+    their default image, each level referencing the one above by id. `pks` restricts it
+    to the given ids of each kind.
+    """
+    catalog = {}
+    for kind, model in CATALOG_KINDS.items():
+        queryset = model.objects.order_by('id')
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks.get(kind, []))
+        catalog[kind] = list(queryset.values(*CATALOG_FIELDS[kind]))
+
+    storage = PlantImage._meta.get_field('image').storage
+    images = PlantImage.objects.filter(default=True).order_by('plant_id', '-id')
+    if pks is not None:
+        images = images.filter(plant_id__in=pks.get('plants', []))
+
+    default_images = {}
+    for plant_id, name in images.values_list('plant_id', 'image'):
+        if name:
+            default_images.setdefault(plant_id, storage.url(name))
+    for plant in catalog['plants']:
+        plant['default_image'] = default_images.get(plant['id'])
+
+    return catalog
+
+
+def write_file(filename, content):
+    """
+    Replace the file atomically, so that a concurrent request never reads half of it.
+    """
+    os.makedirs(settings.CATALOG_BUNDLE_ROOT, exist_ok=True)
+    descriptor, path = tempfile.mkstemp(dir=settings.CATALOG_BUNDLE_ROOT)
+    with os.fdopen(descriptor, 'wb') as file:
+        file.write(content)
+    os.replace(path, get_bundle_path(filename))
+
+
+def remove_superseded_bundles(previous, current):
+    """
+    Remove the bundles superseded for longer than `CATALOG_BUNDLE_GRACE_PERIOD`. The one
+    just superseded is dated now, since a request may have read the previous metadata and
+    be about to open it.
+    """
+    if previous is not None and previous['filename'] != current['filename']:
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(get_bundle_path(previous['filename']))
+
+    expired = time.time() - settings.CATALOG_BUNDLE_GRACE_PERIOD
+    for filename in os.listdir(settings.CATALOG_BUNDLE_ROOT):
+        if filename.startswith('catalog-') and filename != current['filename']:
+            with contextlib.suppress(FileNotFoundError):
+                if os.path.getmtime(get_bundle_path(filename)) < expired:
+                    os.remove(get_bundle_path(filename))
+
+
+def build_bundle():
+    """
+    Write the gzip compressed JSON snapshot of the catalog and its metadata, and return
+    the metadata. The snapshot holds the position of the change log to sync from. Meant
+    to be called with `build_lock` held.
+
+    The version and position are read before the catalog so that a change made meanwhile
+    leaves the bundle stale, and is synced again, rather than being skipped.
+    """
+    version = get_versions([BUNDLE_DEPENDENCY])[0]
+    position = CatalogChange.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    catalog = FastJSONRenderer().render({'position': position, **get_catalog()})
+    # A fixed mtime makes the archive, hence the ETag, depend on the catalog only.
+    content = gzip.compress(catalog, mtime=0)
+    digest = hashlib.sha256(content).hexdigest()
+
+    metadata = {
+        'version': version,
+        'etag': f'"{digest}"',
+        'filename': f'catalog-{digest[:16]}.json.gz',
+        'size': len(content),
+        'built_at': timezone.now().isoformat(),
+    }
+    # Bundles are named after their content and never rewritten in place; the previous
+    # ones go some time after the metadata points to the new one.
+    previous = read_metadata()
+    write_file(metadata['filename'], content)
+    write_file(METADATA_FILENAME, json.dumps(metadata).encode())
+    remove_superseded_bundles(previous, metadata)
+
+    return metadata
+
+
+def read_metadata():
+    try:
+        with open(get_bundle_path(METADATA_FILENAME), 'rb') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(metadata):
+    return (metadata is not None
+            and metadata['version'] == get_versions([BUNDLE_DEPENDENCY])[0]
+            and os.path.exists(get_bundle_path(metadata['filename'])))
+
+
+def get_bundle(rebuild=False):
+    """
+    Return the metadata of an up to date bundle, rebuilding it first if the catalog
+    changed since it was built, if its file is missing or if `rebuild` is set.
+    """
+    metadata = read_metadata()
+    if not rebuild and is_current(metadata):
+        return metadata
+
+    with build_lock():
+        metadata = read_metadata()
+        if not rebuild and is_current(metadata):
+            return metadata
+
+        return build_bundle()
+
+
+def open_bundle(metadata):
+    """
+    Return the metadata and the opened file of the bundle described by `metadata`, or of
+    a rebuilt one if the file went missing since the metadata was read.
+    """
+    try:
+        return metadata, open(get_bundle_path(metadata['filename']), 'rb')
+    except FileNotFoundError:
+        metadata = get_bundle()
+        return metadata, open(get_bundle_path(metadata['filename']), 'rb')
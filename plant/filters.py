@@ -1,7 +1,11 @@
 import django_filters
-from django.db.models import Q
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from rest_framework.filters import BaseFilterBackend
 
 from .models import Plant, PlantGenus, PlantSpecies
+from .search import get_search_query
 
 
 class PlantFilter(django_filters.FilterSet):
@@ -81,3 +85,34 @@ class PlantFilter(django_filters.FilterSet):
         model = Plant
         fields = ['id', 'created_at', 'updated_at',
                   'growth_habit', 'duration', 'genus', 'species']
+
+
+class PlantFullTextSearchFilter(BaseFilterBackend):
+    """
+    Match plants against the `q` query parameter using the indexed search vector and
+    order them by rank. An explicit `ordering` parameter still takes precedence.
+    """
+    search_param = 'q'
+    search_description = 'Full-text search over names, description and medicinal properties.'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+
+        query = get_search_query(terms)
+        # ts_rank() returns a real; as a double the rank survives a round trip through a
+        # keyset pagination cursor unchanged.
+        rank = Cast(SearchRank(F('search_vector'), query), FloatField())
+        return queryset.filter(search_vector=query).annotate(rank=rank).order_by('-rank', '-id')
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': self.search_description,
+            'schema': {
+                'type': 'string',
+            },
+        }]
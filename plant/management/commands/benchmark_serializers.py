@@ -0,0 +1,88 @@
+import time
+from itertools import cycle, islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from contact_us.models import Feedback
+from contact_us.serializers import FeedbackListSerializer, FeedbackListValuesSerializer
+from plant.models import PlantSpecies, PlantGenus, PlantFamily, Plant
+from plant.serializers import (PlantSpeciesSerializer, PlantGenusListSerializer,
+                               PlantFamilyListSerializer, PlantListSerializer,
+                               PlantSpeciesValuesSerializer, PlantGenusListValuesSerializer,
+                               PlantFamilyListValuesSerializer, PlantListValuesSerializer)
+
+
+def get_cases():
+    """
+    Return the (name, queryset, serializer class, values serializer class) of every list
+    endpoint served from `.values()` rows, with the queryset its view lists.
+    """
+    return [
+        ('plants', Plant.objects.select_related('family', 'genus', 'species').prefetch_related(
+            'images'), PlantListSerializer, PlantListValuesSerializer),
+        ('species', PlantSpecies.objects.all(),
+         PlantSpeciesSerializer, PlantSpeciesValuesSerializer),
+        ('genus', PlantGenus.objects.all(),
+         PlantGenusListSerializer, PlantGenusListValuesSerializer),
+        ('family', PlantFamily.objects.all(),
+         PlantFamilyListSerializer, PlantFamilyListValuesSerializer),
+        ('feedback', Feedback.objects.select_related('user'),
+         FeedbackListSerializer, FeedbackListValuesSerializer),
+    ]
+
+
+def measure(function, repeat):
+    """
+    Return the result of `function` and its best running time in milliseconds.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+
+    return result, best
+
+
+class Command(BaseCommand):
+    help = ('Compare the time taken to render list pages with the DRF serializers and with '
+            'their `.values()` counterparts, and check that both render the same JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 500, 1000],
+                            help='Page sizes to render. Rows are repeated to fill the page.')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of runs of which the fastest is kept.')
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        context = {'request': RequestFactory().get('/')}
+
+        for name, queryset, serializer_class, values_serializer_class in get_cases():
+            queryset = queryset.order_by('pk')
+            lookups = values_serializer_class(context=context).get_lookups()
+            instances, rows = list(queryset), list(queryset.prefetch_related(None).values(*lookups))
+            if not instances:
+                self.stdout.write(f'{name}: no rows, skipped.')
+                continue
+
+            for size in options['sizes']:
+                page = list(islice(cycle(instances), size))
+                page_rows = list(islice(cycle(rows), size))
+
+                drf, drf_time = measure(lambda: renderer.render(
+                    serializer_class(page, many=True, context=context).data), options['repeat'])
+                fast, fast_time = measure(lambda: renderer.render(
+                    values_serializer_class(context=context).serialize(page_rows)),
+                    options['repeat'])
+                if drf != fast:
+                    raise CommandError(f'{name}: the rendered JSON differs with {size} rows.')
+
+                self.stdout.write(
+                    f'{name:>8} {size:>6} rows: DRF {drf_time:8.2f} ms, '
+                    f'values {fast_time:8.2f} ms, {drf_time / fast_time:5.1f}x')
+
+        self.stdout.write(self.style.SUCCESS('Both serializers rendered the same JSON.'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from plant.bundle import get_bundle
+
+
+class Command(BaseCommand):
+    help = ('Build the gzip compressed offline catalog bundle served by '
+            '/api/v1/plants/catalog-bundle/, if the catalog changed since the last build.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Rebuild the bundle even if it is up to date.')
+
+    def handle(self, *args, **options):
+        metadata = get_bundle(rebuild=options['force'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Catalog bundle {metadata['filename']} ({metadata['size']} bytes) "
+            f"built at {metadata['built_at']}."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from plant.observations import observations
+
+
+class Command(BaseCommand):
+    help = 'Write the plant observations buffered in the shared cache to the database.'
+
+    def handle(self, *args, **options):
+        plants, latency = observations.flush()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Flushed observations of {plants} plants in {latency:.1f} ms.'))
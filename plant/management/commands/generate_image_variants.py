@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from plant.models import PlantImage
+
+
+class Command(BaseCommand):
+    help = ('Generate the resized variants of the plant images uploaded before they were '
+            'generated on upload, or of every image with --force.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate the variants of the images which have some.')
+
+    def handle(self, *args, **options):
+        images = PlantImage.objects.exclude(image='').order_by('pk')
+        if not options['force']:
+            images = images.filter(variants=[])
+
+        generated = failed = 0
+        for image in images.iterator():
+            try:
+                image.update_variants()
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f'{image.image.name}: {error}')
+            else:
+                generated += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated the variants of {generated} images, {failed} failed.'))
@@ -0,0 +1,21 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from plant.sync import prune_catalog_changes
+
+
+class Command(BaseCommand):
+    help = ('Delete the catalog changes older than CATALOG_CHANGES_RETENTION_DAYS. Clients '
+            'that synced before the pruned position are asked to download the bundle again.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.CATALOG_CHANGES_RETENTION_DAYS,
+                            help='Number of days of changes to keep.')
+
+    def handle(self, *args, **options):
+        pruned = prune_catalog_changes(timezone.now() - datetime.timedelta(days=options['days']))
+
+        self.stdout.write(self.style.SUCCESS(f'Pruned {pruned} catalog changes.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from plant.models import Plant
+from plant.search import update_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recompute the full-text search vector and the flattened names of every plant.'
+
+    def handle(self, *args, **options):
+        plants = update_search_index(Plant.objects.all())
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt the search index of {plants} plants.'))
@@ -0,0 +1,40 @@
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Now
+
+from plant.models import PlantFamily, PlantGenus, Plant
+from utilities.cache import bump_version
+
+
+def count_subquery(model, field):
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+        .annotate(count=Count('pk')).values('count')
+    ), 0)
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored no_of_plants and no_of_species counters in bulk.'
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        families = self.reconcile(PlantFamily, 'no_of_plants', 'family')
+        genuses = self.reconcile(PlantGenus, 'no_of_species', 'genus')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled counters of {families} families and {genuses} genuses.'))
+
+    def reconcile(self, model, field, lookup):
+        """
+        Rewrite the counters which drifted. Like the counter signals, touch updated_at for
+        the ETags to change, and evict the cached responses once the counters are committed.
+        """
+        updated = model.objects.annotate(count=count_subquery(Plant, lookup)).exclude(
+            **{field: F('count')}).update(**{field: F('count')}, updated_at=Now())
+        if updated:
+            transaction.on_commit(partial(bump_version, model._meta.label))
+
+        return updated
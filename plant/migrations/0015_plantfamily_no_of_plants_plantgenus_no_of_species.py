@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 20:58
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, field):
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+        .annotate(count=Count('pk')).values('count')
+    ), 0)
+
+
+def populate_counters(apps, schema_editor):
+    PlantFamily = apps.get_model('plant', 'PlantFamily')
+    PlantGenus = apps.get_model('plant', 'PlantGenus')
+    PlantSpecies = apps.get_model('plant', 'PlantSpecies')
+    Plant = apps.get_model('plant', 'Plant')
+
+    PlantFamily.objects.update(no_of_plants=count_subquery(Plant, 'family'))
+    PlantGenus.objects.update(
+        no_of_species=count_subquery(PlantSpecies, 'genus'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0014_alter_plant_other_resources_links'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plantfamily',
+            name='no_of_plants',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='plantgenus',
+            name='no_of_species',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
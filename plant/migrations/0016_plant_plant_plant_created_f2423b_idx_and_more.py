@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0015_plantfamily_no_of_plants_plantgenus_no_of_species'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='plant',
+            index=models.Index(fields=['created_at', 'id'], name='plant_plant_created_f2423b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=models.Index(fields=['updated_at', 'id'], name='plant_plant_updated_600cb0_idx'),
+        ),
+    ]
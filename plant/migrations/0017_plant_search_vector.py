@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import Func, OuterRef, Subquery, TextField
+
+
+def populate_search_vectors(apps, schema_editor):
+    Plant = apps.get_model('plant', 'Plant')
+    PlantGenus = apps.get_model('plant', 'PlantGenus')
+    PlantSpecies = apps.get_model('plant', 'PlantSpecies')
+
+    def array_to_string(field):
+        return Func(field, function='array_to_string', template="%(function)s(%(expressions)s, ' ')",
+                    output_field=TextField())
+
+    def strip_tags(field):
+        return Func(field, function='regexp_replace', template="%(function)s(%(expressions)s, '<[^>]*>', ' ', 'g')",
+                    output_field=TextField())
+
+    genus = Subquery(PlantGenus.objects.filter(
+        pk=OuterRef('genus_id')).values('title')[:1])
+    species = Subquery(PlantSpecies.objects.filter(
+        pk=OuterRef('species_id')).values('title')[:1])
+
+    Plant.objects.update(search_vector=(
+        SearchVector(genus, species, weight='A', config='simple')
+        + SearchVector(array_to_string('common_names'), weight='A', config='english')
+        + SearchVector(array_to_string('common_names_ne'), weight='A', config='simple')
+        + SearchVector(strip_tags('medicinal_properties'), weight='B', config='english')
+        + SearchVector(strip_tags('description'), weight='C', config='english')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0016_plant_plant_plant_created_f2423b_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plant',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='plant_plant_search__2a699a_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:04
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.db.models import Func, OuterRef, Subquery, TextField
+
+
+def populate_search_names(apps, schema_editor):
+    Plant = apps.get_model('plant', 'Plant')
+    PlantGenus = apps.get_model('plant', 'PlantGenus')
+    PlantSpecies = apps.get_model('plant', 'PlantSpecies')
+
+    def array_to_string(field):
+        return Func(field, function='array_to_string', template="%(function)s(%(expressions)s, ' ')",
+                    output_field=TextField())
+
+    genus = Subquery(PlantGenus.objects.filter(
+        pk=OuterRef('genus_id')).values('title')[:1])
+    species = Subquery(PlantSpecies.objects.filter(
+        pk=OuterRef('species_id')).values('title')[:1])
+
+    Plant.objects.update(search_names=Func(
+        genus, species, array_to_string('common_names'), array_to_string('common_names_ne'),
+        function='concat_ws', template="%(function)s(' ', %(expressions)s)", output_field=TextField()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0017_plant_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='plant',
+            name='search_names',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_names,
+                             migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='plant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_names'], name='plant_search_names_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='plantfamily',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='plant_family_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='plantgenus',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='plant_genus_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='plantspecies',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='plant_species_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:10
+
+from django.db import migrations, models
+from django.utils.crypto import get_random_string
+from django.utils.text import slugify
+
+
+def populate_scientific_names(apps, schema_editor):
+    Plant = apps.get_model('plant', 'Plant')
+
+    plants = list(Plant.objects.select_related('genus', 'species').order_by('id'))
+    slugs = set()
+    for plant in plants:
+        if plant.species is not None:
+            plant.scientific_name = f'{plant.genus.title} {plant.species.title}'.strip()
+        else:
+            plant.scientific_name = plant.genus.title
+
+        slug = unique_slug = slugify(plant.scientific_name)
+        while unique_slug in slugs:
+            unique_slug = slug + "-" + get_random_string(length=4)
+        plant.slug = unique_slug
+        slugs.add(unique_slug)
+
+    Plant.objects.bulk_update(plants, ['scientific_name', 'slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0018_trigram_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plant',
+            name='scientific_name',
+            field=models.CharField(editable=False, max_length=201, null=True,
+                                   verbose_name='scientific_name'),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='slug',
+            field=models.SlugField(db_index=False, editable=False, max_length=255, null=True,
+                                   verbose_name='slug'),
+        ),
+        migrations.RunPython(populate_scientific_names,
+                             migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='plant',
+            name='scientific_name',
+            field=models.CharField(db_index=True, editable=False, max_length=201,
+                                   verbose_name='scientific_name'),
+        ),
+        migrations.AlterField(
+            model_name='plant',
+            name='slug',
+            field=models.SlugField(editable=False, max_length=255, unique=True,
+                                   verbose_name='slug'),
+        ),
+    ]
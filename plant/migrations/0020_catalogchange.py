@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+
+def log_existing_rows(apps, schema_editor):
+    """
+    Log every existing row as saved, so that syncing from the start yields the catalog.
+    """
+    CatalogChange = apps.get_model('plant', 'CatalogChange')
+
+    for kind, model_name in (('families', 'PlantFamily'), ('genuses', 'PlantGenus'),
+                             ('species', 'PlantSpecies'), ('plants', 'Plant')):
+        pks = apps.get_model('plant', model_name).objects.order_by('id').values_list('id', flat=True)
+        CatalogChange.objects.bulk_create(
+            [CatalogChange(kind=kind, object_id=pk) for pk in pks], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0019_plant_scientific_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('families', 'Family'), ('genuses', 'Genus'), ('species', 'Species'), ('plants', 'Plant')], max_length=8)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Catalog Change',
+                'verbose_name_plural': 'Catalog Changes',
+                'ordering': ('id',),
+            },
+        ),
+        migrations.RunPython(log_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:29
+
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import Func, OuterRef, Subquery, TextField
+
+from utilities.html import clean_html, make_excerpt
+
+
+HTML_FIELDS = {
+    'description': ('description_text', 'description_excerpt'),
+    'description_ne': ('description_text_ne', 'description_excerpt_ne'),
+    'medicinal_properties': ('medicinal_properties_text', 'medicinal_properties_excerpt'),
+    'medicinal_properties_ne': ('medicinal_properties_text_ne', 'medicinal_properties_excerpt_ne'),
+}
+
+
+def populate_text_columns(apps, schema_editor):
+    """
+    Fill the plain text and excerpt columns of the existing plants, and index the plain
+    text in place of the HTML stripped of its tags.
+    """
+    Plant = apps.get_model('plant', 'Plant')
+    PlantGenus = apps.get_model('plant', 'PlantGenus')
+    PlantSpecies = apps.get_model('plant', 'PlantSpecies')
+
+    plants = list(Plant.objects.only(*HTML_FIELDS).order_by('id'))
+    for plant in plants:
+        for name, (text_name, excerpt_name) in HTML_FIELDS.items():
+            _, text = clean_html(getattr(plant, name))
+            setattr(plant, text_name, text)
+            setattr(plant, excerpt_name, make_excerpt(text))
+    Plant.objects.bulk_update(plants, [column for columns in HTML_FIELDS.values()
+                                       for column in columns], batch_size=500)
+
+    def array_to_string(field):
+        return Func(field, function='array_to_string', template="%(function)s(%(expressions)s, ' ')",
+                    output_field=TextField())
+
+    genus = Subquery(PlantGenus.objects.filter(
+        pk=OuterRef('genus_id')).values('title')[:1])
+    species = Subquery(PlantSpecies.objects.filter(
+        pk=OuterRef('species_id')).values('title')[:1])
+
+    Plant.objects.update(search_vector=(
+        SearchVector(genus, species, weight='A', config='simple')
+        + SearchVector(array_to_string('common_names'), weight='A', config='english')
+        + SearchVector(array_to_string('common_names_ne'), weight='A', config='simple')
+        + SearchVector('medicinal_properties_text', weight='B', config='english')
+        + SearchVector('medicinal_properties_text_ne', weight='B', config='simple')
+        + SearchVector('description_text', weight='C', config='english')
+        + SearchVector('description_text_ne', weight='C', config='simple')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0020_catalogchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plant',
+            name='description_excerpt',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='description_excerpt_ne',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='description_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='description_text_ne',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='medicinal_properties_excerpt',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='medicinal_properties_excerpt_ne',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='medicinal_properties_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='medicinal_properties_text_ne',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(populate_text_columns,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0021_html_text_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plantimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
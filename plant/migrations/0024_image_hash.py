@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:36
+
+from django.db import migrations, models
+import plant.models
+import utilities.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0023_image_details'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plantimage',
+            name='image_hash',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='plantimage',
+            name='image',
+            field=models.ImageField(upload_to=plant.models.get_upload_to, validators=[utilities.validators.ImageValidator(size=1024000), utilities.validators.UniqueImageValidator()]),
+        ),
+    ]
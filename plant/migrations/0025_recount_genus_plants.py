@@ -0,0 +1,24 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_genus_plants(apps, schema_editor):
+    PlantGenus = apps.get_model('plant', 'PlantGenus')
+    Plant = apps.get_model('plant', 'Plant')
+
+    PlantGenus.objects.update(no_of_species=Coalesce(Subquery(
+        Plant.objects.filter(genus=OuterRef('pk')).order_by().values('genus')
+        .annotate(count=Count('pk')).values('count')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0024_image_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_genus_plants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plant', '0025_recount_genus_plants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='catalogchange',
+            name='kind',
+            field=models.CharField(choices=[('families', 'Family'), ('genuses', 'Genus'), ('species', 'Species'), ('plants', 'Plant'), ('pruned', 'Pruned')], max_length=8),
+        ),
+    ]
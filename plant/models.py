@@ -1,14 +1,19 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Now
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django_ckeditor_5.fields import CKEditor5Field
 from django.template.defaultfilters import slugify
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
 from django.utils.safestring import mark_safe
 
-from utilities.models import TimeStamp
+from utilities.cache import bump_version
+from utilities.images import generate_variants, delete_variants
+from utilities.models import CleanHTMLMixin, ImageDetailsMixin, TimeStamp
 from utilities.utils import unique_update_slugify
-from utilities.validators import ImageValidator
+from utilities.validators import ImageValidator, UniqueImageValidator
 
 
 def get_upload_to(instance,  filename):
@@ -41,11 +46,16 @@ class PlantFamily(TimeStamp):
     title = models.CharField('title', max_length=100, unique=True)
     slug = models.SlugField('slug', max_length=255,
                             unique=True, null=True, blank=True)
+    no_of_plants = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Plant Family"
         verbose_name_plural = "Plant Families"
         ordering = ('id', )
+        indexes = [
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'],
+                     name='plant_family_title_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.title}"
@@ -61,10 +71,6 @@ class PlantFamily(TimeStamp):
             self, self._state.adding, slugify(self.title))
         super(PlantFamily, self).save(*args, **kwargs)
 
-    @property
-    def no_of_plants(self):
-        return self.plants.all().count()
-
 
 class PlantGenus(TimeStamp):
     title = models.CharField('title', max_length=100, unique=True)
@@ -72,11 +78,17 @@ class PlantGenus(TimeStamp):
                             unique=True, null=True, blank=True)
     family = models.ForeignKey(
         PlantFamily, on_delete=models.CASCADE, related_name='genuses')
+    # Despite its name, the number of plants of the genus, as the API has always rendered.
+    no_of_species = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Plant Genus"
         verbose_name_plural = "Plant Genuses"
         ordering = ('id', )
+        indexes = [
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'],
+                     name='plant_genus_title_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.title}"
@@ -92,10 +104,6 @@ class PlantGenus(TimeStamp):
             self, self._state.adding, slugify(self.title))
         super(PlantGenus, self).save(*args, **kwargs)
 
-    @property
-    def no_of_species(self):
-        return self.genus.all().count()
-
 
 class PlantSpecies(TimeStamp):
     title = models.CharField('title', max_length=100, unique=True)
@@ -108,6 +116,10 @@ class PlantSpecies(TimeStamp):
         verbose_name = "Plant Species"
         verbose_name_plural = "Plant Species"
         ordering = ('id', )
+        indexes = [
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'],
+                     name='plant_species_title_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.title}"
@@ -124,7 +136,7 @@ class PlantSpecies(TimeStamp):
         super(PlantSpecies, self).save(*args, **kwargs)
 
 
-class Plant(TimeStamp):
+class Plant(CleanHTMLMixin, TimeStamp):
     Annual = 'annual'
     Biennial = 'biennial'
     Perennial = 'perennial'
@@ -164,6 +176,15 @@ class Plant(TimeStamp):
     description_ne = CKEditor5Field()
     medicinal_properties = CKEditor5Field()
     medicinal_properties_ne = CKEditor5Field()
+    # Plain text and excerpts of the rich text fields, written on save.
+    description_text = models.TextField(default='', editable=False)
+    description_text_ne = models.TextField(default='', editable=False)
+    description_excerpt = models.CharField(max_length=255, default='', editable=False)
+    description_excerpt_ne = models.CharField(max_length=255, default='', editable=False)
+    medicinal_properties_text = models.TextField(default='', editable=False)
+    medicinal_properties_text_ne = models.TextField(default='', editable=False)
+    medicinal_properties_excerpt = models.CharField(max_length=255, default='', editable=False)
+    medicinal_properties_excerpt_ne = models.CharField(max_length=255, default='', editable=False)
     duration = models.CharField(max_length=10, choices=Duration)
     growth_habit = models.CharField(max_length=10, choices=Growth)
     wikipedia_link = models.CharField(
@@ -177,11 +198,59 @@ class Plant(TimeStamp):
         PlantGenus, related_name='genus', on_delete=models.PROTECT)
     species = models.ForeignKey(PlantSpecies, related_name='species',
                                 null=True, blank=True, default=None, on_delete=models.SET_NULL)
+    # Not unique: deleting a species leaves its plants named after the genus only, like
+    # plants of the genus without a species. New plants are checked by `clean`.
+    scientific_name = models.CharField(
+        'scientific_name', max_length=201, db_index=True, editable=False)
+    slug = models.SlugField('slug', max_length=255, unique=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_names = models.TextField(default='', editable=False)
+
+    html_fields = {
+        'description': ('description_text', 'description_excerpt'),
+        'description_ne': ('description_text_ne', 'description_excerpt_ne'),
+        'medicinal_properties': ('medicinal_properties_text', 'medicinal_properties_excerpt'),
+        'medicinal_properties_ne': ('medicinal_properties_text_ne',
+                                    'medicinal_properties_excerpt_ne'),
+    }
 
     class Meta:
         verbose_name = 'Plant'
         verbose_name_plural = 'Plants'
         ordering = ('-id',)
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+            GinIndex(fields=['search_vector']),
+            GinIndex(fields=['search_names'], opclasses=['gin_trgm_ops'],
+                     name='plant_search_names_trgm'),
+        ]
+
+    def clean(self):
+        if self.genus_id is not None and Plant.objects.filter(
+                scientific_name=self.get_scientific_name()).exclude(pk=self.pk).exists():
+            raise ValidationError(
+                {'species': 'A plant with this scientific name already exists.'})
+
+    def update_scientific_name(self):
+        """
+        Denormalize the scientific name and its slug from the genus and species titles.
+        Return whether they changed.
+        """
+        scientific_name = self.get_scientific_name()
+        if scientific_name == self.scientific_name and self.slug:
+            return False
+
+        self.scientific_name = scientific_name
+        self.slug = unique_update_slugify(
+            self, self._state.adding, slugify(scientific_name))
+        return True
+
+    def save(self, *args, **kwargs):
+        self.update_scientific_name()
+        # Keep the family counter maintained by the save signals in the same transaction.
+        with transaction.atomic():
+            super(Plant, self).save(*args, **kwargs)
 
     def get_scientific_name(self):
         if self.species is not None:
@@ -209,7 +278,7 @@ class Plant(TimeStamp):
     default_image_tag.short_description = 'Default Image'
 
 
-class PlantImage(TimeStamp):
+class PlantImage(ImageDetailsMixin, TimeStamp):
     Flower = 'flower'
     Leaf = 'leaf'
     Fruit = 'fruit'
@@ -228,8 +297,48 @@ class PlantImage(TimeStamp):
         Plant, on_delete=models.CASCADE, related_name='images')
     part = models.CharField(max_length=7, choices=Part)
     image = models.ImageField(upload_to=get_upload_to, validators=[
-        ImageValidator(size=1000*1024)])
+        ImageValidator(size=1000*1024), UniqueImageValidator()])
     default = models.BooleanField(default=False)
+    # Written on upload, see `ImageDetailsMixin`.
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.CharField(max_length=64, blank=True, default='', editable=False)
+    image_color = models.CharField(max_length=7, blank=True, default='', editable=False)
+    image_hash = models.BigIntegerField(null=True, blank=True, editable=False, db_index=True)
+    # Resized copies of the image, generated on upload: see `utilities.images`.
+    variants = models.JSONField(default=list, blank=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        uploaded = bool(self.image) and not self.image._committed
+        super().save(*args, **kwargs)
+        # The file is only stored, hence named, by the save. The variants are generated once
+        # the row is committed, so that no upload runs while the row is locked and none is
+        # left behind by a rollback. A failure is logged, the command generates them later.
+        if uploaded:
+            transaction.on_commit(self.update_variants, robust=True)
+
+    def update_variants(self):
+        """
+        Regenerate the variants of the image, store them and delete the previous ones. The
+        new ones are deleted instead if the row was deleted, or its image replaced, in the
+        meantime.
+        """
+        storage = self.image.storage
+        variants = generate_variants(self.image)
+        # Bump updated_at too, the ETags of the responses are derived from it.
+        updated = PlantImage.objects.filter(pk=self.pk, image=self.image.name).update(
+            variants=variants, updated_at=Now())
+        if not updated:
+            delete_variants(storage, variants)
+            return
+
+        delete_variants(storage, self.variants)
+        self.variants = variants
+        # The update sends no signal: evict the cached responses and log the plant for the
+        # delta syncs like the catalog signals do.
+        bump_version(PlantImage._meta.label)
+        bump_version(Plant._meta.label)
+        CatalogChange.objects.create(kind=CatalogChange.Plants, object_id=self.plant_id)
 
     def image_tag(self):
         if self.image:
@@ -249,3 +358,37 @@ class PlantImage(TimeStamp):
 
     def __str__(self):
         return f'{self.image}'
+
+
+class CatalogChange(models.Model):
+    """
+    Log of the catalog rows saved or deleted, written by signals once the change is
+    committed and read by the delta sync endpoint. The id is the sync position. Once the
+    log is pruned, a single `Pruned` entry marks the position up to which it was.
+    """
+    Families = 'families'
+    Genuses = 'genuses'
+    Species = 'species'
+    Plants = 'plants'
+    Pruned = 'pruned'
+
+    Kind = (
+        (Families, 'Family'),
+        (Genuses, 'Genus'),
+        (Species, 'Species'),
+        (Plants, 'Plant'),
+        (Pruned, 'Pruned'),
+    )
+
+    kind = models.CharField(max_length=8, choices=Kind)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Catalog Change'
+        verbose_name_plural = 'Catalog Changes'
+        ordering = ('id',)
+
+    def __str__(self):
+        return f"{'Deleted' if self.deleted else 'Saved'} {self.kind} {self.object_id}"
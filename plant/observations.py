@@ -0,0 +1,169 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+
+from .models import Plant
+from utilities.cache import bump_version
+
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEY_PREFIX = 'plant-observations'
+FLUSH_LOCK_KEY = f'{COUNTER_KEY_PREFIX}:flush-lock'
+# Version bumped by the flushes, so that only the responses rendering the counts are
+# invalidated rather than everything depending on the plants.
+OBSERVATIONS_DEPENDENCY = 'plant.Plant.no_of_observations'
+
+
+def get_counter_key(plant_id):
+    return f'{COUNTER_KEY_PREFIX}:{plant_id}'
+
+
+def uses_shared_cache():
+    """
+    Buffer in the cache only if it is shared by the processes and increments atomically,
+    which is the case of the Redis and Memcached backends.
+    """
+    if settings.OBSERVATION_BUFFER != 'auto':
+        return settings.OBSERVATION_BUFFER == 'cache'
+
+    backend = settings.CACHES['default']['BACKEND']
+    return backend.startswith(('django.core.cache.backends.redis',
+                               'django.core.cache.backends.memcached'))
+
+
+def apply_increments(increments):
+    """
+    Add the buffered `increments`, a mapping of plant id to count, to the stored counters
+    with a single UPDATE joined to a VALUES list. Ids of deleted plants match no row.
+    `updated_at` is bumped too, the ETags of the plant responses being derived from it.
+    """
+    if not increments:
+        return
+
+    table = connection.ops.quote_name(Plant._meta.db_table)
+    values = ', '.join(['(%s::bigint, %s::integer)'] * len(increments))
+    params = [value for item in increments.items() for value in item]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} AS plant '
+            f'SET no_of_observations = plant.no_of_observations + observation.count, '
+            f'updated_at = now() '
+            f'FROM (VALUES {values}) AS observation (id, count) '
+            f'WHERE plant.id = observation.id',
+            params)
+
+
+class ObservationBuffer:
+    """
+    Write-behind buffer of `Plant.no_of_observations` increments. Recording an observation
+    only touches memory, or the shared cache when there is one, and a background thread
+    flushes the buffer every `OBSERVATION_FLUSH_INTERVAL` seconds, so at most that many
+    seconds of observations are lost if a process dies.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.flusher = None
+
+    def record(self, plant_id, count=1):
+        if uses_shared_cache():
+            key = get_counter_key(plant_id)
+            if not cache.add(key, count, timeout=None):
+                cache.incr(key, count)
+        else:
+            with self.lock:
+                self.pending[plant_id] += count
+
+        self.start()
+
+    def start(self):
+        if self.flusher is not None and self.flusher.is_alive():
+            return
+
+        with self.lock:
+            if self.flusher is None or not self.flusher.is_alive():
+                if self.flusher is None:
+                    atexit.register(self.flush)
+                self.flusher = threading.Thread(
+                    target=self.run, name='plant-observations-flusher', daemon=True)
+                self.flusher.start()
+
+    def run(self):
+        while True:
+            time.sleep(settings.OBSERVATION_FLUSH_INTERVAL)
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Flushing plant observations failed')
+
+    def take_local(self):
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+
+        return pending
+
+    def take_shared(self):
+        """
+        Read the counters of every plant from the cache and subtract what was read, so
+        that increments recorded meanwhile stay for the next flush.
+        """
+        keys = {get_counter_key(pk): pk for pk in Plant.objects.values_list('pk', flat=True)}
+        pending = Counter()
+        for key, count in cache.get_many(keys).items():
+            if count:
+                cache.decr(key, count)
+                pending[keys[key]] = count
+
+        return pending
+
+    def restore(self, pending):
+        for plant_id, count in pending.items():
+            self.record(plant_id, count)
+
+    def flush(self):
+        """
+        Write the buffered increments to the database and return how many plants were
+        updated and how long it took in milliseconds. Only one process flushes the shared
+        cache at a time.
+        """
+        shared = uses_shared_cache()
+        if shared and not cache.add(FLUSH_LOCK_KEY, True, timeout=settings.OBSERVATION_FLUSH_INTERVAL):
+            return 0, 0.0
+
+        try:
+            started = time.perf_counter()
+            pending = self.take_shared() if shared else self.take_local()
+            try:
+                with transaction.atomic():
+                    apply_increments(pending)
+            except Exception:
+                self.restore(pending)
+                raise
+
+            if pending:
+                bump_version(OBSERVATIONS_DEPENDENCY)
+
+            latency = (time.perf_counter() - started) * 1000
+            logger.info('Flushed observations of %d plants in %.1f ms', len(pending), latency)
+
+            return len(pending), latency
+        finally:
+            if shared:
+                cache.delete(FLUSH_LOCK_KEY)
+
+
+observations = ObservationBuffer()
+
+
+def record_observation(plant_id, count=1):
+    observations.record(plant_id, count)
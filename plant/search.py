@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchVector, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import Func, OuterRef, Subquery, TextField
+
+from .models import PlantGenus, PlantSpecies
+
+
+class ArrayToString(Func):
+    function = 'array_to_string'
+    template = "%(function)s(%(expressions)s, ' ')"
+    output_field = TextField()
+
+
+class ConcatWords(Func):
+    function = 'concat_ws'
+    template = "%(function)s(' ', %(expressions)s)"
+    output_field = TextField()
+
+
+def get_scientific_name_parts():
+    genus = Subquery(PlantGenus.objects.filter(
+        pk=OuterRef('genus_id')).values('title')[:1])
+    species = Subquery(PlantSpecies.objects.filter(
+        pk=OuterRef('species_id')).values('title')[:1])
+
+    return genus, species
+
+
+def get_search_vector():
+    """
+    Build the weighted document of a plant. Nepali text and scientific names go through the
+    `simple` configuration since PostgreSQL has no Nepali dictionary and Latin names must
+    not be stemmed as English. The rich text fields are indexed from their plain text.
+    """
+    genus, species = get_scientific_name_parts()
+
+    return (
+        SearchVector(genus, species, weight='A', config='simple')
+        + SearchVector(ArrayToString('common_names'), weight='A', config='english')
+        + SearchVector(ArrayToString('common_names_ne'), weight='A', config='simple')
+        + SearchVector('medicinal_properties_text', weight='B', config='english')
+        + SearchVector('medicinal_properties_text_ne', weight='B', config='simple')
+        + SearchVector('description_text', weight='C', config='english')
+        + SearchVector('description_text_ne', weight='C', config='simple')
+    )
+
+
+def get_search_names():
+    """
+    Flatten the scientific name and the English and Nepali common names of a plant into
+    one string for typo-tolerant trigram matching.
+    """
+    genus, species = get_scientific_name_parts()
+
+    return ConcatWords(genus, species, ArrayToString('common_names'), ArrayToString('common_names_ne'))
+
+
+def update_search_index(queryset):
+    """
+    Recompute the search vector and the flattened names of every plant in `queryset` with
+    a single UPDATE.
+    """
+    return queryset.update(search_vector=get_search_vector(), search_names=get_search_names())
+
+
+def get_search_query(terms):
+    return (SearchQuery(terms, config='english', search_type='websearch')
+            | SearchQuery(terms, config='simple', search_type='websearch'))
+
+
+def find_similar(queryset, field, terms, threshold=None, limit=10):
+    """
+    Return the rows of `queryset` whose `field` contains a word similar to `terms`, most
+    similar first. The `<%` operator is answered from the pg_trgm GIN index of `field`;
+    the threshold is set for the current transaction only.
+    """
+    if threshold is None:
+        threshold = settings.FUZZY_SEARCH_THRESHOLD
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                           [str(threshold)])
+
+        return list(queryset.filter(**{f'{field}__trigram_word_similar': terms}).annotate(
+            similarity=TrigramWordSimilarity(terms, field)).order_by('-similarity', 'pk')[:limit])
@@ -1,6 +1,33 @@
 from rest_framework import serializers
+from drf_spectacular.utils import extend_schema_field
 
 from .models import PlantSpecies, PlantGenus, PlantFamily, PlantImage, Plant
+from utilities.fast_serializers import ValuesSerializer, represent_datetime, represent_file
+from utilities.images import represent_srcset
+
+
+# Plant fields stored in English, with the Nepali variant in `<name>_ne`.
+TRANSLATED_FIELDS = ('common_names', 'description', 'medicinal_properties', 'description_excerpt')
+
+
+class FieldProjectionMixin:
+    """
+    Let the view drop fields from a serializer by passing the `fields` to keep. With a
+    `language`, the translated fields render the `localized_<name>` value annotated by the
+    view instead and their Nepali variants are dropped.
+    """
+
+    def __init__(self, *args, fields=None, language=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+        if language is not None:
+            for name in TRANSLATED_FIELDS:
+                self.fields.pop(f'{name}_ne', None)
+                if name in self.fields:
+                    self.fields[name] = serializers.ReadOnlyField(source=f'localized_{name}')
 
 
 class PlantSpeciesSerializer(serializers.ModelSerializer):
@@ -50,39 +77,309 @@ class PlantFamilySerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at', 'updated_at', 'slug', )
 
 
+@extend_schema_field({'type': 'object', 'additionalProperties': {'type': 'string'},
+                      'example': {'webp': 'https://example.com/a-320w.webp 320w, '
+                                          'https://example.com/a-640w.webp 640w'}})
+class SrcsetField(serializers.ReadOnlyField):
+    """
+    The resized variants of an image, as a `srcset` attribute per format, best first.
+    """
+
+    def to_representation(self, value):
+        storage = PlantImage._meta.get_field('image').storage
+        return represent_srcset(represent_file(storage, self.context.get('request')))(value)
+
+
 class PlantImageSerializer(serializers.ModelSerializer):
     plant = serializers.StringRelatedField()
+    srcset = SrcsetField(source='variants')
 
     class Meta:
-        fields = ("id", "plant", "part", "image",
-                  "default", "created_at", "updated_at")
+        fields = ("id", "plant", "part", "image", "srcset", "image_width", "image_height",
+                  "image_placeholder", "image_color", "default", "created_at", "updated_at")
         model = PlantImage
         read_only_fields = ('id', 'created_at', 'updated_at', )
 
 
-class PlantListSerializer(serializers.ModelSerializer):
+class PlantListSerializer(FieldProjectionMixin, serializers.ModelSerializer):
     family = serializers.StringRelatedField(read_only=True)
     genus = serializers.StringRelatedField(read_only=True)
     species = serializers.StringRelatedField(read_only=True)
     images = PlantImageSerializer(read_only=True, many=True)
 
     class Meta:
-        fields = ("id", "common_names", "common_names_ne", "family",
+        fields = ("id", "scientific_name", "slug", "common_names", "common_names_ne",
+                  "description_excerpt", "description_excerpt_ne", "family",
                   "genus", "species", "images", "created_at", "updated_at")
         model = Plant
-        read_only_fields = ("id", "common_names", "common_names_ne", "family",
-                            "genus", "species", "images", "created_at", "updated_at")
+        read_only_fields = fields
+
+
+class PlantCompactListSerializer(FieldProjectionMixin, serializers.ModelSerializer):
+    family = serializers.StringRelatedField(read_only=True)
+    genus = serializers.StringRelatedField(read_only=True)
+    species = serializers.StringRelatedField(read_only=True)
+    default_image = serializers.SerializerMethodField()
+    no_of_images = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        fields = ("id", "scientific_name", "slug", "common_names", "common_names_ne",
+                  "description_excerpt", "description_excerpt_ne", "family",
+                  "genus", "species", "default_image", "no_of_images", "created_at", "updated_at")
+        model = Plant
+        read_only_fields = fields
+
+    @extend_schema_field(PlantImageSerializer(allow_null=True))
+    def get_default_image(self, obj):
+        default_images = obj.default_images
+        if default_images:
+            return PlantImageSerializer(default_images[0], context=self.context).data
 
+        return None
 
-class PlantDetailsSerializer(serializers.ModelSerializer):
+
+class PlantDetailsSerializer(FieldProjectionMixin, serializers.ModelSerializer):
     family = serializers.StringRelatedField(read_only=True)
     genus = serializers.StringRelatedField(read_only=True)
     species = serializers.StringRelatedField(read_only=True)
     images = PlantImageSerializer(read_only=True, many=True)
 
     class Meta:
-        fields = ("id", "common_names", "common_names_ne", "description", "description_ne", "medicinal_properties",
+        fields = ("id", "scientific_name", "slug", "common_names", "common_names_ne", "description", "description_ne",
+                  "description_excerpt", "description_excerpt_ne", "medicinal_properties",
                   "medicinal_properties_ne", "duration", "growth_habit", "wikipedia_link",
                   "other_resources_links", "no_of_observations", "family", "genus",
                   "species", "images", "created_at", "updated_at")
         model = Plant
+
+
+class TaxonomyTreeSpeciesSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    slug = serializers.SlugField(allow_null=True)
+    plants = serializers.ListField(child=serializers.IntegerField())
+
+
+class TaxonomyTreeGenusSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    slug = serializers.SlugField(allow_null=True)
+    species = TaxonomyTreeSpeciesSerializer(many=True)
+    plants = serializers.ListField(child=serializers.IntegerField())
+
+
+class TaxonomyTreeFamilySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    slug = serializers.SlugField(allow_null=True)
+    genuses = TaxonomyTreeGenusSerializer(many=True)
+
+
+class FuzzySearchQuerySerializer(serializers.Serializer):
+    KINDS = ('plant', 'family', 'genus', 'species')
+
+    q = serializers.CharField(max_length=255)
+    kind = serializers.ChoiceField(choices=KINDS, default='plant')
+    threshold = serializers.FloatField(
+        min_value=0, max_value=1, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class PlantFuzzyMatchSerializer(serializers.ModelSerializer):
+    family = serializers.StringRelatedField(read_only=True)
+    similarity = serializers.FloatField()
+
+    class Meta:
+        fields = ("id", "scientific_name", "slug", "family",
+                  "common_names", "common_names_ne", "similarity")
+        model = Plant
+        read_only_fields = fields
+
+
+class TaxonFuzzyMatchSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    slug = serializers.SlugField(allow_null=True)
+    similarity = serializers.FloatField()
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=10)
+
+
+class AutocompleteSuggestionSerializer(serializers.Serializer):
+    KINDS = ('plant', 'family', 'genus', 'species')
+
+    kind = serializers.ChoiceField(choices=KINDS)
+    id = serializers.IntegerField()
+    text = serializers.CharField()
+    slug = serializers.SlugField(allow_null=True)
+
+
+@extend_schema_field({'oneOf': [{'type': 'integer'}, {'type': 'string'}]})
+class PlantReferenceField(serializers.Field):
+    """
+    A plant id, or a scientific name or slug such as "Azadirachta indica".
+    """
+    default_error_messages = {
+        'invalid': 'Expected a plant id or a scientific name.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) and data.strip().isdigit():
+            return int(data)
+        if isinstance(data, int) and not isinstance(data, bool):
+            return data
+        if isinstance(data, str) and data.strip():
+            return data.strip()
+
+        self.fail('invalid')
+
+    def to_representation(self, value):
+        return value
+
+
+class PlantResolveRequestSerializer(serializers.Serializer):
+    plants = serializers.ListField(
+        child=PlantReferenceField(), min_length=1, max_length=20)
+    fields = serializers.MultipleChoiceField(
+        choices=PlantDetailsSerializer.Meta.fields, required=False, allow_empty=False)
+
+
+class PlantResolveResultSerializer(serializers.Serializer):
+    query = PlantReferenceField()
+    plant = PlantDetailsSerializer(allow_null=True)
+
+
+# `.values()` counterparts of the list serializers above, rendering the same data. See
+# `utilities.fast_serializers`.
+
+TIMESTAMP_FIELDS = (
+    ('created_at', 'created_at', represent_datetime),
+    ('updated_at', 'updated_at', represent_datetime),
+)
+
+
+class PlantSpeciesValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id', None),
+        *TIMESTAMP_FIELDS,
+        ('title', 'title', None),
+        ('slug', 'slug', None),
+        ('genus', 'genus', None),
+    )
+
+
+class PlantGenusListValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id', None),
+        ('no_of_species', 'no_of_species', None),
+        *TIMESTAMP_FIELDS,
+        ('title', 'title', None),
+        ('slug', 'slug', None),
+        ('family', 'family', None),
+    )
+
+
+class PlantFamilyListValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id', None),
+        ('no_of_plants', 'no_of_plants', None),
+        *TIMESTAMP_FIELDS,
+        ('title', 'title', None),
+        ('slug', 'slug', None),
+    )
+
+
+class PlantImageValuesSerializer(ValuesSerializer):
+    fields = (
+        ('id', 'id', None),
+        ('plant', ('plant__genus__title', 'plant__species__title'), 'get_plant'),
+        ('part', 'part', None),
+        ('image', 'image', 'get_image'),
+        ('srcset', 'variants', 'get_srcset'),
+        ('image_width', 'image_width', None),
+        ('image_height', 'image_height', None),
+        ('image_placeholder', 'image_placeholder', None),
+        ('image_color', 'image_color', None),
+        ('default', 'default', None),
+        *TIMESTAMP_FIELDS,
+    )
+
+    def __init__(self, fields=None, context=None):
+        self.get_image = represent_file(PlantImage._meta.get_field('image').storage,
+                                        (context or {}).get('request'))
+        self.get_srcset = represent_srcset(self.get_image)
+        super().__init__(fields, context)
+
+    def get_plant(self, genus, species):
+        if species is not None:
+            return f'{genus} {species}'.strip()
+
+        return f'{genus}'
+
+
+class PlantListValuesSerializer(ValuesSerializer):
+    """
+    With a `language`, the translated fields are read from the `localized_<name>` values
+    annotated by the view, like `FieldProjectionMixin` does.
+    """
+    fields = (
+        ('id', 'id', None),
+        ('scientific_name', 'scientific_name', None),
+        ('slug', 'slug', None),
+        ('common_names', 'common_names', None),
+        ('common_names_ne', 'common_names_ne', None),
+        ('description_excerpt', 'description_excerpt', None),
+        ('description_excerpt_ne', 'description_excerpt_ne', None),
+        ('family', 'family__title', None),
+        ('genus', 'genus__title', None),
+        ('species', 'species__title', None),
+        ('images', 'id', 'get_images'),
+        *TIMESTAMP_FIELDS,
+    )
+
+    def __init__(self, fields=None, context=None, language=None):
+        self.language = language
+        self.images = {}
+        super().__init__(fields, context)
+
+    def get_fields(self):
+        if self.language is None:
+            return self.fields
+
+        variants = [f'{name}_ne' for name in TRANSLATED_FIELDS]
+        return [(name, f'localized_{name}' if name in TRANSLATED_FIELDS else lookups, converter)
+                for name, lookups, converter in self.fields if name not in variants]
+
+    def prepare(self, rows):
+        """
+        Load the images of every plant of `rows` with a single query.
+        """
+        if 'images' not in self.field_names:
+            return
+
+        serializer = PlantImageValuesSerializer(context=self.context)
+        images = PlantImage.objects.filter(plant_id__in=[row['id'] for row in rows]).values(
+            'plant_id', *serializer.get_lookups())
+
+        self.images = {}
+        for image in images:
+            self.images.setdefault(image['plant_id'], []).append(
+                serializer.to_representation(image))
+
+    def get_images(self, pk):
+        return self.images.get(pk, [])
+
+
+class CatalogChangesQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=5000, default=1000)
+
+
+class CatalogChangesSerializer(serializers.Serializer):
+    upserts = serializers.DictField(child=serializers.ListField(child=serializers.DictField()))
+    tombstones = serializers.DictField(child=serializers.ListField(child=serializers.IntegerField()))
+    next = serializers.IntegerField()
+    has_more = serializers.BooleanField()
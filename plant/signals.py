@@ -0,0 +1,226 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .autocomplete import plant_names
+from .bundle import BUNDLE_DEPENDENCY, CATALOG_KINDS
+from .models import PlantFamily, PlantGenus, PlantSpecies, Plant, PlantImage, CatalogChange
+from .observations import get_counter_key
+from .search import update_search_index
+from utilities.cache import bump_version
+from utilities.images import delete_variants
+
+
+CATALOG_MODELS = (PlantFamily, PlantGenus, PlantSpecies, Plant, PlantImage)
+
+
+def adjust_counter(model, pk, field, delta):
+    """
+    Atomically add `delta` to a counter column. Counters never go below zero even if they
+    drifted; `manage.py reconcile_plant_counters` recomputes them from scratch.
+
+    The counters are rendered with the row, so `updated_at` is touched too for its ETag
+    and Last-Modified to change.
+    """
+    if pk is not None:
+        model.objects.filter(pk=pk).update(
+            **{field: Greatest(F(field) + delta, 0)}, updated_at=Now())
+
+
+def move_counter(model, field, old_pk, new_pk):
+    if old_pk != new_pk:
+        adjust_counter(model, old_pk, field, -1)
+        adjust_counter(model, new_pk, field, 1)
+
+
+@receiver(pre_save, sender=Plant)
+def remember_plant_taxonomy(sender, instance, **kwargs):
+    # Fixtures save rows with a primary key that does not exist yet.
+    instance._previous_family_id, instance._previous_genus_id = Plant.objects.filter(
+        pk=instance.pk).values_list('family_id', 'genus_id').first() or (None, None)
+
+
+@receiver(post_save, sender=Plant)
+def count_saved_plant(sender, instance, **kwargs):
+    move_counter(PlantFamily, 'no_of_plants',
+                 instance._previous_family_id, instance.family_id)
+    move_counter(PlantGenus, 'no_of_species',
+                 instance._previous_genus_id, instance.genus_id)
+
+
+@receiver(post_delete, sender=Plant)
+def count_deleted_plant(sender, instance, **kwargs):
+    adjust_counter(PlantFamily, instance.family_id, 'no_of_plants', -1)
+    adjust_counter(PlantGenus, instance.genus_id, 'no_of_species', -1)
+
+
+def update_scientific_names(queryset):
+    """
+    Re-derive the scientific name and slug of the plants in `queryset` after a genus or
+    species they are named after changed.
+    """
+    for plant in queryset.select_related('genus', 'species'):
+        # One by one, so that each slug is made unique against those written before it.
+        if plant.update_scientific_name():
+            Plant.objects.filter(pk=plant.pk).update(
+                scientific_name=plant.scientific_name, slug=plant.slug)
+
+
+@receiver(post_save, sender=PlantGenus)
+def rename_genus_plants(sender, instance, **kwargs):
+    update_scientific_names(Plant.objects.filter(genus=instance))
+
+
+@receiver(post_save, sender=PlantSpecies)
+def rename_species_plants(sender, instance, **kwargs):
+    update_scientific_names(Plant.objects.filter(species=instance))
+
+
+@receiver(pre_delete, sender=PlantSpecies)
+def remember_species_plants(sender, instance, **kwargs):
+    # The plants are detached with a bulk SET NULL, so collect them before it happens.
+    instance._plant_ids = list(Plant.objects.filter(
+        species=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=PlantSpecies)
+def rename_detached_plants(sender, instance, **kwargs):
+    plants = Plant.objects.filter(pk__in=instance._plant_ids)
+    update_scientific_names(plants)
+    update_search_index(plants)
+
+
+@receiver(post_save, sender=Plant)
+def index_saved_plant(sender, instance, **kwargs):
+    update_search_index(Plant.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=PlantGenus)
+def reindex_genus_plants(sender, instance, **kwargs):
+    update_search_index(Plant.objects.filter(genus=instance))
+
+
+@receiver(post_save, sender=PlantSpecies)
+def reindex_species_plants(sender, instance, **kwargs):
+    update_search_index(Plant.objects.filter(species=instance))
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    """
+    Evict the cached responses depending on the changed model once the change is
+    committed, so that a concurrent request can not cache the old rows again.
+    """
+    transaction.on_commit(partial(bump_version, sender._meta.label))
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_cached_responses, sender=model,
+                      dispatch_uid=f'invalidate_cached_{model._meta.label}_on_save')
+    post_delete.connect(invalidate_cached_responses, sender=model,
+                        dispatch_uid=f'invalidate_cached_{model._meta.label}_on_delete')
+
+
+def mark_catalog_bundle_stale(sender, **kwargs):
+    """
+    Have the offline catalog bundle rebuilt on next download once the change is committed.
+    """
+    transaction.on_commit(partial(bump_version, BUNDLE_DEPENDENCY))
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(mark_catalog_bundle_stale, sender=model,
+                      dispatch_uid=f'mark_catalog_bundle_stale_{model._meta.label}_on_save')
+    post_delete.connect(mark_catalog_bundle_stale, sender=model,
+                        dispatch_uid=f'mark_catalog_bundle_stale_{model._meta.label}_on_delete')
+
+
+CHANGE_KINDS = {model: kind for kind, model in CATALOG_KINDS.items()}
+
+
+def log_catalog_changes(kind, pks, deleted=False):
+    """
+    Append the rows to the change log read by delta syncs once the change is committed,
+    so that the log only holds changes clients can see.
+    """
+    changes = [CatalogChange(kind=kind, object_id=pk, deleted=deleted) for pk in pks]
+    if changes:
+        transaction.on_commit(partial(CatalogChange.objects.bulk_create, changes))
+
+
+def log_saved_row(sender, instance, **kwargs):
+    log_catalog_changes(CHANGE_KINDS[sender], [instance.pk])
+
+
+def log_deleted_row(sender, instance, **kwargs):
+    log_catalog_changes(CHANGE_KINDS[sender], [instance.pk], deleted=True)
+
+
+for model in CHANGE_KINDS:
+    post_save.connect(log_saved_row, sender=model,
+                      dispatch_uid=f'log_catalog_change_{model._meta.label}_on_save')
+    post_delete.connect(log_deleted_row, sender=model,
+                        dispatch_uid=f'log_catalog_change_{model._meta.label}_on_delete')
+
+
+@receiver(post_save, sender=PlantGenus)
+def log_genus_plants(sender, instance, **kwargs):
+    # The scientific names of the plants are updated in bulk, without signals.
+    log_catalog_changes(CatalogChange.Plants, Plant.objects.filter(
+        genus=instance).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=PlantSpecies)
+def log_species_plants(sender, instance, **kwargs):
+    log_catalog_changes(CatalogChange.Plants, Plant.objects.filter(
+        species=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=PlantSpecies)
+def log_detached_plants(sender, instance, **kwargs):
+    log_catalog_changes(CatalogChange.Plants, instance._plant_ids)
+
+
+@receiver(post_save, sender=PlantImage)
+@receiver(post_delete, sender=PlantImage)
+def log_image_plant(sender, instance, **kwargs):
+    # Plants carry the URL of their default image.
+    log_catalog_changes(CatalogChange.Plants, [instance.plant_id])
+
+
+AUTOCOMPLETE_KINDS = {PlantFamily: 'family', PlantGenus: 'genus',
+                      PlantSpecies: 'species', Plant: 'plant'}
+
+
+def refresh_autocomplete(sender, instance, **kwargs):
+    """
+    Patch the in-process autocomplete index after the cached response versions were
+    bumped, which is why this receiver is connected after `invalidate_cached_responses`.
+    """
+    transaction.on_commit(partial(plant_names.refresh, sender._meta.label,
+                                  AUTOCOMPLETE_KINDS[sender], instance.pk,
+                                  getattr(instance, '_plant_ids', ())))
+
+
+for model in AUTOCOMPLETE_KINDS:
+    post_save.connect(refresh_autocomplete, sender=model,
+                      dispatch_uid=f'refresh_autocomplete_{model._meta.label}_on_save')
+    post_delete.connect(refresh_autocomplete, sender=model,
+                        dispatch_uid=f'refresh_autocomplete_{model._meta.label}_on_delete')
+
+
+@receiver(post_delete, sender=Plant)
+def discard_observations(sender, instance, **kwargs):
+    # The flush only reads the counters of existing plants, that of a deleted one would
+    # stay in the shared cache for good.
+    transaction.on_commit(partial(cache.delete, get_counter_key(instance.pk)))
+
+
+@receiver(post_delete, sender=PlantImage)
+def delete_image_variants(sender, instance, **kwargs):
+    # Once the deletion is committed, no row references the variants any more.
+    transaction.on_commit(partial(delete_variants, instance.image.storage, instance.variants))
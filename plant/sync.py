@@ -0,0 +1,75 @@
+import datetime
+from itertools import takewhile
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .bundle import CATALOG_KINDS, get_catalog
+from .models import CatalogChange
+
+
+def get_pruned_position():
+    """
+    Return the position up to which the log was pruned, 0 if it never was. Clients behind
+    it have to download the catalog bundle again.
+    """
+    return CatalogChange.objects.filter(kind=CatalogChange.Pruned).values_list(
+        'id', flat=True).first() or 0
+
+
+def prune_catalog_changes(before):
+    """
+    Delete the log entries made before the datetime `before` and return how many were.
+    The newest of them becomes the `Pruned` marker instead of being deleted.
+    """
+    position = CatalogChange.objects.filter(changed_at__lt=before).order_by('-id').values_list(
+        'id', flat=True).first()
+    if position is None:
+        return 0
+
+    with transaction.atomic():
+        CatalogChange.objects.filter(id=position).update(kind=CatalogChange.Pruned, deleted=False)
+        pruned, _ = CatalogChange.objects.filter(id__lt=position).delete()
+
+    return pruned
+
+
+def get_catalog_changes(since, limit):
+    """
+    Return the catalog changes logged after the position `since`, reading at most `limit`
+    log entries. Only the last change of each row counts: saved rows come back in the
+    shape of the catalog bundle, deleted ones as the ids in `tombstones`. `next` is the
+    position to sync from next time, and `has_more` tells whether to do so right away.
+
+    The entries are written after their transaction commits, so one may become visible
+    after an entry with a higher id. The log is therefore only read up to the first entry
+    younger than `CATALOG_SYNC_DELAY` seconds, by which time those before it are visible.
+    """
+    settled_at = timezone.now() - datetime.timedelta(seconds=settings.CATALOG_SYNC_DELAY)
+    entries = list(CatalogChange.objects.filter(id__gt=since).order_by('id').values_list(
+        'id', 'kind', 'object_id', 'deleted', 'changed_at')[:limit + 1])
+    entries = list(takewhile(lambda entry: entry[-1] < settled_at, entries))
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    deleted = {}
+    for _, kind, pk, is_deleted, _ in entries:
+        deleted[kind, pk] = is_deleted
+
+    upserts = get_catalog({kind: [pk for (row_kind, pk), is_deleted in deleted.items()
+                                  if row_kind == kind and not is_deleted]
+                           for kind in CATALOG_KINDS})
+
+    # A row saved then deleted by a change beyond this batch is gone already.
+    found = {(kind, row['id']) for kind, rows in upserts.items() for row in rows}
+    tombstones = {kind: sorted(pk for (row_kind, pk) in deleted
+                               if row_kind == kind and (row_kind, pk) not in found)
+                  for kind in CATALOG_KINDS}
+
+    return {
+        'upserts': upserts,
+        'tombstones': tombstones,
+        'next': entries[-1][0] if entries else since,
+        'has_more': has_more,
+    }
@@ -1,3 +1,344 @@
-from django.test import TestCase
+import base64
+import datetime
+import fcntl
+import gzip
+import json
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from utilities.cache import get_versions
+
+from .bundle import (LOCK_FILENAME, build_lock, get_bundle, get_bundle_path,
+                     remove_superseded_bundles)
+from .models import PlantFamily, PlantGenus, PlantSpecies, Plant, CatalogChange
+from .observations import OBSERVATIONS_DEPENDENCY, ObservationBuffer
+
+
+def create_plant(genus, species=None, name=None):
+    name = name or f'{genus} {species or ""}'.strip()
+    return Plant.objects.create(
+        family=genus.family, genus=genus, species=species,
+        common_names=[name], common_names_ne=[f'{name} ne'],
+        description=f'<p>The leaves of {name}.</p>', description_ne='<p>पात</p>',
+        medicinal_properties='<p>Heals wounds.</p>', medicinal_properties_ne='<p>घाउ</p>',
+        duration=Plant.Perennial, growth_habit=Plant.Tree)
+
+
+class CatalogTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.family = PlantFamily.objects.create(title='Meliaceae')
+        cls.genus = PlantGenus.objects.create(title='Azadirachta', family=cls.family)
+        cls.species = PlantSpecies.objects.create(title='indica', genus=cls.genus)
+        cls.plant = create_plant(cls.genus, cls.species, 'Neem')
+
+    def setUp(self):
+        # Cached responses, their versions and the throttling history live in the cache.
+        cache.clear()
+
+
+class ResponseCacheTests(CatalogTestCase):
+
+    def get_names(self):
+        response = self.client.get(reverse('plant-list'))
+        self.assertEqual(response.status_code, 200)
+        return [name for plant in response.data['results'] for name in plant['common_names']]
+
+    def test_list_is_cached_until_a_plant_changes(self):
+        self.assertEqual(self.get_names(), ['Neem'])
+
+        # A bulk update sends no signal, the cached response is served.
+        Plant.objects.filter(pk=self.plant.pk).update(common_names=['Nim'])
+        self.assertEqual(self.get_names(), ['Neem'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plant.refresh_from_db()
+            self.plant.common_names = ['Margosa']
+            self.plant.save()
+        self.assertEqual(self.get_names(), ['Margosa'])
+
+    def test_genus_list_is_invalidated_by_a_new_plant(self):
+        response = self.client.get(reverse('plant-genus-list'))
+        self.assertEqual(response.data['results'][0]['no_of_species'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_plant(self.genus, name='Bead tree')
+
+        response = self.client.get(reverse('plant-genus-list'))
+        self.assertEqual(response.data['results'][0]['no_of_species'], 2)
+
+
+class KeysetPaginationTests(CatalogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.others = [create_plant(cls.genus, name=name) for name in ('Bead tree', 'Chinaberry')]
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def assertSeparateResponses(self, first, second):
+        first_response = self.client.get(reverse('plant-list'), first)
+        second_response = self.client.get(reverse('plant-list'), second)
+
+        self.assertNotEqual(first_response['ETag'], second_response['ETag'])
+        return first_response.data, second_response.data
+
+    def test_offset_and_keyset_pages_are_cached_apart(self):
+        offset, keyset = self.assertSeparateResponses({'limit': 1}, {'limit': 1, 'cursor': ''})
+
+        self.assertIn('count', offset)
+        self.assertNotIn('count', keyset)
+
+    def test_keyset_and_offset_pages_are_cached_apart(self):
+        keyset, offset = self.assertSeparateResponses({'limit': 1, 'cursor': ''}, {'limit': 1})
+
+        self.assertNotIn('count', keyset)
+        self.assertIn('count', offset)
+
+    def test_cursor_walks_every_plant(self):
+        ids, url = [], reverse('plant-list') + '?limit=1&cursor='
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [plant['id'] for plant in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(ids, sorted(Plant.objects.values_list('id', flat=True), reverse=True))
+
+    def test_forged_cursors_are_not_found(self):
+        for params in ({'cursor': 'garbage'},
+                       {'cursor': self.encode_cursor({'v': None, 'id': 2 ** 63})},
+                       {'cursor': self.encode_cursor({'v': 'not a date', 'id': 1}),
+                        'ordering': 'created_at'}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse('plant-list'), params)
+                self.assertEqual(response.status_code, 404)
+
+
+class CompactListTests(CatalogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.others = [create_plant(cls.genus, name=name) for name in ('Bead tree', 'Chinaberry')]
+
+    def test_compact_list_is_ordered(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('plant-list'), {'images': 'default', 'limit': 2})
+
+        self.assertEqual([plant['id'] for plant in response.data['results']],
+                         [self.others[1].pk, self.others[0].pk])
+        page = next(query['sql'] for query in queries
+                    if 'COUNT' in query['sql'] and 'LIMIT' in query['sql'])
+        self.assertIn('ORDER BY', page)
+
+
+class CounterTests(CatalogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other_family = PlantFamily.objects.create(title='Lamiaceae')
+        cls.other_genus = PlantGenus.objects.create(title='Ocimum', family=cls.other_family)
+
+    def assertCounters(self):
+        for family in PlantFamily.objects.all():
+            self.assertEqual(family.no_of_plants, family.plants.count(), family)
+        for genus in PlantGenus.objects.all():
+            self.assertEqual(genus.no_of_species, Plant.objects.filter(genus=genus).count(), genus)
+
+    def test_counters_follow_plants(self):
+        plant = create_plant(self.genus, name='Bead tree')
+        self.assertCounters()
+        self.assertEqual(PlantGenus.objects.get(pk=self.genus.pk).no_of_species, 2)
+
+        plant.family, plant.genus = self.other_family, self.other_genus
+        plant.save()
+        self.assertCounters()
+        self.assertEqual(PlantFamily.objects.get(pk=self.other_family.pk).no_of_plants, 1)
+
+        plant.delete()
+        self.assertCounters()
+        self.assertEqual(PlantGenus.objects.get(pk=self.other_genus.pk).no_of_species, 0)
+
+    def test_counters_survive_a_species_move(self):
+        self.species.genus = self.other_genus
+        self.species.save()
+        self.assertCounters()
+
+        self.species.delete()
+        self.assertCounters()
+        self.assertEqual(PlantGenus.objects.get(pk=self.genus.pk).no_of_species, 1)
+
+    def test_counter_changes_invalidate_cached_responses(self):
+        response = self.client.get(reverse('plant-family-list'))
+        self.assertEqual(response.data['results'][0]['no_of_plants'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plant.delete()
+
+        response = self.client.get(reverse('plant-family-list'))
+        self.assertEqual(response.data['results'][0]['no_of_plants'], 0)
+
+    def test_reconcile_fixes_drifted_counters(self):
+        PlantFamily.objects.update(no_of_plants=7)
+        PlantGenus.objects.update(no_of_species=0)
+        version = get_versions([PlantFamily._meta.label])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('reconcile_plant_counters', stdout=StringIO())
+
+        self.assertCounters()
+        self.assertNotEqual(get_versions([PlantFamily._meta.label]), version)
+
+
+class ObservationTests(CatalogTestCase):
+
+    def test_unknown_plants_are_not_buffered(self):
+        with mock.patch('plant.views.record_observation') as record:
+            for pk in ('0', '²', str(2 ** 63), str(self.plant.pk + 100)):
+                with self.subTest(pk=pk):
+                    response = self.client.post(reverse('plant-observe', args=[pk]))
+                    self.assertEqual(response.status_code, 404)
+
+        record.assert_not_called()
+
+    def test_observation_is_buffered(self):
+        with mock.patch('plant.views.record_observation') as record:
+            response = self.client.post(reverse('plant-observe', args=[self.plant.pk]))
+
+        self.assertEqual(response.status_code, 202)
+        record.assert_called_once_with(self.plant.pk)
+
+    @mock.patch.object(ObservationBuffer, 'start')
+    def test_flush_writes_the_buffered_counts(self, start):
+        for buffer in ('local', 'cache'):
+            with self.subTest(buffer=buffer), override_settings(OBSERVATION_BUFFER=buffer):
+                plant = Plant.objects.get(pk=self.plant.pk)
+                versions = get_versions([OBSERVATIONS_DEPENDENCY, Plant._meta.label])
+                observations = ObservationBuffer()
+                observations.record(plant.pk)
+                observations.record(plant.pk, 2)
+
+                self.assertEqual(observations.flush()[0], 1)
+
+                flushed = Plant.objects.get(pk=plant.pk)
+                self.assertEqual(flushed.no_of_observations, plant.no_of_observations + 3)
+                # now() is frozen for the test transaction, compare with the creation time.
+                self.assertNotEqual(flushed.updated_at, self.plant.updated_at)
+                observations_version, plant_version = get_versions(
+                    [OBSERVATIONS_DEPENDENCY, Plant._meta.label])
+                self.assertNotEqual(observations_version, versions[0])
+                self.assertEqual(plant_version, versions[1])
+                self.assertEqual(observations.flush()[0], 0)
+
+
+class CatalogBundleTests(CatalogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(CATALOG_BUNDLE_ROOT=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def download(self, **headers):
+        response = self.client.get(reverse('plant-catalog-bundle'), headers=headers)
+        if response.status_code == 200:
+            response.bundle = json.loads(gzip.decompress(b''.join(response.streaming_content)))
+        return response
+
+    def test_bundle_is_downloaded_once_per_version(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([plant['id'] for plant in response.bundle['plants']], [self.plant.pk])
+
+        self.assertEqual(self.download(if_none_match=response['ETag']).status_code, 304)
+
+    def test_missing_bundle_is_rebuilt(self):
+        os.remove(get_bundle_path(get_bundle()['filename']))
+
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.bundle['plants']), 1)
+
+    def test_superseded_bundle_is_kept_for_the_grace_period(self):
+        previous = get_bundle()
+        with self.captureOnCommitCallbacks(execute=True):
+            create_plant(self.genus, name='Bead tree')
+        current = get_bundle()
+
+        self.assertNotEqual(current['filename'], previous['filename'])
+        self.assertTrue(os.path.exists(get_bundle_path(previous['filename'])))
+
+        expired = time.time() - 60
+        os.utime(get_bundle_path(previous['filename']), (expired, expired))
+        with override_settings(CATALOG_BUNDLE_GRACE_PERIOD=0):
+            remove_superseded_bundles(current, current)
+        self.assertFalse(os.path.exists(get_bundle_path(previous['filename'])))
+        self.assertTrue(os.path.exists(get_bundle_path(current['filename'])))
+
+    def test_builds_exclude_each_other(self):
+        with build_lock(), open(get_bundle_path(LOCK_FILENAME), 'wb') as file:
+            with self.assertRaises(BlockingIOError):
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        with open(get_bundle_path(LOCK_FILENAME), 'wb') as file:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+class CatalogChangesTests(CatalogTestCase):
+
+    def log(self, kind, pk, age):
+        change = CatalogChange.objects.create(kind=kind, object_id=pk)
+        CatalogChange.objects.filter(pk=change.pk).update(changed_at=timezone.now() - age)
+        return change
+
+    def get_changes(self, since):
+        return self.client.get(reverse('plant-changes'), {'since': since})
+
+    @override_settings(CATALOG_SYNC_DELAY=60)
+    def test_recent_changes_hold_back_the_later_ones(self):
+        settled = self.log(CatalogChange.Plants, self.plant.pk, datetime.timedelta(minutes=5))
+        self.log(CatalogChange.Families, self.family.pk, datetime.timedelta(seconds=1))
+        self.log(CatalogChange.Genuses, self.genus.pk, datetime.timedelta(minutes=5))
+
+        response = self.get_changes(0)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['next'], settled.pk)
+        self.assertEqual([plant['id'] for plant in response.data['upserts']['plants']],
+                         [self.plant.pk])
+        self.assertEqual(response.data['upserts']['genuses'], [])
+
+    def test_clients_behind_the_pruned_position_resync(self):
+        old = [self.log(CatalogChange.Plants, self.plant.pk, datetime.timedelta(days=40))
+               for _ in range(3)]
+        recent = self.log(CatalogChange.Genuses, self.genus.pk, datetime.timedelta(days=1))
+
+        call_command('prune_catalog_changes', days=30, stdout=StringIO())
+
+        self.assertEqual(list(CatalogChange.objects.values_list('id', 'kind')),
+                         [(old[-1].pk, CatalogChange.Pruned), (recent.pk, CatalogChange.Genuses)])
+        for since in (0, old[0].pk):
+            with self.subTest(since=since):
+                self.assertEqual(self.get_changes(since).status_code, 410)
+
+        response = self.get_changes(old[-1].pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['next'], recent.pk)
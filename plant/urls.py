@@ -5,7 +5,6 @@ from plant import views
 
 router = DefaultRouter()
 
-router.register(r'plants', views.PlantViewset, 'plant')
 router.register(r'plants/plant-species',
                 views.PlantSpeciesViewset, 'plant-species')
 router.register(r'plants/plant-genus', views.PlantGenusViewset, 'plant-genus')
@@ -13,6 +12,8 @@ router.register(r'plants/plant-family',
                 views.PlantFamilyViewset, 'plant-family')
 router.register(r'plants/plant-images',
                 views.PlantImageViewset, 'plant-images')
+# Registered last so that `plants/<pk>/` does not shadow the nested prefixes above.
+router.register(r'plants', views.PlantViewset, 'plant')
 
 app = 'plant'
 
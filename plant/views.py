@@ -1,26 +1,205 @@
+from django.http import FileResponse, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions, viewsets, filters
-from drf_spectacular.utils import extend_schema
+from rest_framework import permissions, viewsets, filters, serializers, throttling
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (extend_schema, extend_schema_view, inline_serializer,
+                                   OpenApiParameter, PolymorphicProxySerializer)
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Case, Count, F, Prefetch, Q, TextField, Value, When, Window
+from django.db.models.functions import Coalesce, NullIf, RowNumber
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
+from django.utils.text import slugify
 from django.views.decorators.csrf import csrf_protect
 
-from .filters import PlantFilter
+from .filters import PlantFilter, PlantFullTextSearchFilter
 from .models import PlantSpecies, PlantGenus, PlantFamily, PlantImage, Plant
 from account.permissions import IsVerifiedUser
+from utilities.cache import cache_response
+from utilities.language import LanguageNegotiationMixin
+from utilities.negotiation import IgnoreClientContentNegotiation
+from utilities.pagination import MAX_ID, KeysetPagination
+from utilities.renderers import FastJSONRenderer, NDJSONRenderer
+from utilities.conditional import (ConditionalGetMixin, conditional_response,
+                                   get_queryset_validators)
+from utilities.fast_serializers import ValuesListMixin, iter_serialized
 from .serializers import (PlantSpeciesSerializer, PlantGenusSerializer,
                           PlantGenusListSerializer, PlantFamilyListSerializer,
                           PlantFamilySerializer, PlantImageSerializer, PlantListSerializer,
-                          PlantDetailsSerializer)
+                          PlantCompactListSerializer, PlantDetailsSerializer,
+                          TaxonomyTreeFamilySerializer, FuzzySearchQuerySerializer,
+                          PlantFuzzyMatchSerializer, TaxonFuzzyMatchSerializer,
+                          AutocompleteQuerySerializer, AutocompleteSuggestionSerializer,
+                          PlantResolveRequestSerializer, PlantResolveResultSerializer,
+                          PlantSpeciesValuesSerializer, PlantGenusListValuesSerializer,
+                          PlantFamilyListValuesSerializer, PlantListValuesSerializer,
+                          CatalogChangesQuerySerializer, CatalogChangesSerializer,
+                          TRANSLATED_FIELDS)
+from .autocomplete import plant_names
+from .bundle import get_bundle, open_bundle
+from .sync import get_catalog_changes, get_pruned_position
+from .observations import OBSERVATIONS_DEPENDENCY, record_observation
+from .search import find_similar
+
+
+# Models whose changes invalidate the cached responses of each endpoint.
+SPECIES_DEPENDENCIES = ('plant.PlantSpecies',)
+GENUS_DEPENDENCIES = ('plant.PlantGenus', 'plant.PlantSpecies', 'plant.Plant')
+FAMILY_LIST_DEPENDENCIES = ('plant.PlantFamily', 'plant.Plant')
+FAMILY_DEPENDENCIES = ('plant.PlantFamily',
+                       'plant.PlantGenus', 'plant.PlantSpecies')
+CATALOG_DEPENDENCIES = ('plant.PlantFamily', 'plant.PlantGenus', 'plant.PlantSpecies',
+                        'plant.Plant', 'plant.PlantImage')
+# The plants also render their observation counts, which are flushed in batches.
+PLANT_DEPENDENCIES = (*CATALOG_DEPENDENCIES, OBSERVATIONS_DEPENDENCY)
+
+PLANT_TAXONOMY_FIELDS = ('family', 'genus', 'species')
+
+# Number of plants read from the database cursor, and serialized, at a time by the export.
+EXPORT_CHUNK_SIZE = 500
+
+
+def get_nested_bounds(request, prefix):
+    """
+    Read the `<prefix>_offset` and `<prefix>_limit` query parameters used to paginate a
+    nested list. Returns None when the nested list is not limited.
+    """
+    bounds = []
+    for name in ('offset', 'limit'):
+        value = request.query_params.get(f'{prefix}_{name}')
+        if value in (None, ''):
+            bounds.append(None)
+            continue
+        try:
+            value = int(value)
+            if value < 0:
+                raise ValueError
+        except ValueError:
+            raise ValidationError(
+                {"message": f"{prefix}_{name} must be a positive integer."})
+        bounds.append(value)
+
+    if bounds == [None, None]:
+        return None
+
+    return bounds[0] or 0, bounds[1]
+
+
+def get_projected_fields(request, serializer_class, language=None):
+    """
+    Return the fields of `serializer_class` selected by the comma separated `fields` and
+    `omit` query parameters, e.g. `?fields=id,common_names,images` or `?omit=description`.
+    The Nepali variants are not available once a single `language` is negotiated.
+    """
+    available = serializer_class.Meta.fields
+    if language is not None:
+        available = [field for field in available
+                     if field not in [f'{name}_ne' for name in TRANSLATED_FIELDS]]
+    selected = {}
+    for name in ('fields', 'omit'):
+        value = request.query_params.get(name) or ''
+        selected[name] = [field.strip() for field in value.split(',') if field.strip()]
+        unknown = set(selected[name]) - set(available)
+        if unknown:
+            raise ValidationError(
+                {"message": f"Unknown {name}: {', '.join(sorted(unknown))}."})
+
+    return [field for field in available
+            if (not selected['fields'] or field in selected['fields'])
+            and field not in selected['omit']]
+
+
+def get_localized_field(name, language):
+    """
+    Select the `language` variant of a translated plant field, falling back to the other
+    language when it is empty.
+    """
+    preferred, fallback = (f'{name}_ne', name) if language == 'ne' else (name, f'{name}_ne')
+    if name == 'common_names':
+        return Case(When(**{f'{preferred}__len': 0}, then=F(fallback)), default=F(preferred),
+                    output_field=Plant._meta.get_field(name))
+
+    return Coalesce(NullIf(F(preferred), Value('')), F(fallback), output_field=TextField())
+
+
+def project_queryset(queryset, fields, keep=(), language=None):
+    """
+    Read only the plant columns and relations rendered for `fields`; the rich text
+    columns in particular are never loaded unless asked for. Images render the plant
+    name, so they need the genus and species. `keep` lists columns to load regardless,
+    such as those the page is ordered by. With a `language`, each translated field is
+    read as a single `localized_<name>` value picked by the database.
+    """
+    names = 'images' in fields or 'default_image' in fields
+    related = [field for field in PLANT_TAXONOMY_FIELDS
+               if field in fields or (names and field != 'family')]
+    localized = [name for name in TRANSLATED_FIELDS if language is not None and name in fields]
+    translated = [*TRANSLATED_FIELDS, *[f'{name}_ne' for name in TRANSLATED_FIELDS]]
+    columns = [field for field in fields if language is None or field not in translated]
+    deferred = [field.name for field in Plant._meta.concrete_fields
+                if not field.is_relation and not field.primary_key
+                and field.name not in columns and field.name not in keep]
+
+    queryset = queryset.defer(*deferred).annotate(**{
+        f'localized_{name}': get_localized_field(name, language) for name in localized})
+    if related:
+        queryset = queryset.select_related(*related)
+    if 'images' in fields:
+        queryset = queryset.prefetch_related('images')
+
+    return queryset
+
+
+def nested_queryset(queryset, request, prefix, partition_by):
+    """
+    Limit a queryset used in a `Prefetch` to a window of rows per parent. The window is
+    applied with ROW_NUMBER() so that all parents are still served by a single query.
+    """
+    bounds = get_nested_bounds(request, prefix)
+    if bounds is None:
+        return queryset
+
+    offset, limit = bounds
+    queryset = queryset.annotate(position=Window(
+        RowNumber(), partition_by=F(partition_by), order_by=F('id').asc())).filter(position__gt=offset)
+    if limit is not None:
+        queryset = queryset.filter(position__lte=offset + limit)
+
+    return queryset
+
+
+PROJECTION_PARAMETERS = [
+    OpenApiParameter('fields', str, description='Comma separated fields to return.'),
+    OpenApiParameter('omit', str, description='Comma separated fields to leave out.'),
+    OpenApiParameter('lang', str, enum=['en', 'ne', 'all'],
+                     description='Return the translated fields in one language, falling back to '
+                                 'the other one, instead of both. Defaults to Accept-Language.'),
+]
+
+NESTED_LIST_PARAMETERS = {
+    prefix: [
+        OpenApiParameter(f'{prefix}_limit', int,
+                         description=f'Number of nested {prefix} to return.'),
+        OpenApiParameter(f'{prefix}_offset', int,
+                         description=f'Position of the first nested {prefix} to return.'),
+    ] for prefix in ('genus', 'species')
+}
 
 
 @method_decorator(csrf_protect, name='dispatch')
+@method_decorator(conditional_response(), name='list')
+@method_decorator(conditional_response(), name='retrieve')
+@method_decorator(cache_response(*SPECIES_DEPENDENCIES), name='list')
+@method_decorator(cache_response(*SPECIES_DEPENDENCIES), name='retrieve')
 @extend_schema(summary='Plant Species Viewset', tags=['Plant Species'])
-class PlantSpeciesViewset(viewsets.ModelViewSet):
+class PlantSpeciesViewset(ValuesListMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = PlantSpecies.objects.all()
     serializer_class = PlantSpeciesSerializer
+    values_serializer_class = PlantSpeciesValuesSerializer
     permission_classes = (permissions.IsAdminUser, )
     lookup_field = 'slug'
     filter_backends = [
@@ -58,10 +237,16 @@ class PlantSpeciesViewset(viewsets.ModelViewSet):
 
 
 @method_decorator(csrf_protect, name='dispatch')
+@method_decorator(conditional_response(), name='list')
+@method_decorator(conditional_response(), name='retrieve')
+@method_decorator(cache_response(*GENUS_DEPENDENCIES), name='list')
+@method_decorator(cache_response(*GENUS_DEPENDENCIES), name='retrieve')
 @extend_schema(summary='Plant Genus Viewset', tags=['Plant Genus'])
-class PlantGenusViewset(viewsets.ModelViewSet):
+@extend_schema_view(retrieve=extend_schema(parameters=NESTED_LIST_PARAMETERS['species']))
+class PlantGenusViewset(ValuesListMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = PlantGenus.objects.all()
     serializer_class = PlantGenusSerializer
+    values_serializer_class = PlantGenusListValuesSerializer
     permission_classes = (permissions.IsAdminUser, )
     lookup_field = 'slug'
     filter_backends = [
@@ -73,10 +258,21 @@ class PlantGenusViewset(viewsets.ModelViewSet):
         "id": ["exact"],
         "created_at": ["gte", "lte", "exact", "gt", "lt"],
         "updated_at": ["gte", "lte", "exact", "gt", "lt"],
-        "family__title": ["exact"]
+        "family__title": ["exact"],
+        "no_of_species": ["exact", "gte", "lte", "gt", "lt"],
     }
     search_fields = ["id", "title", "family__title"]
-    ordering_fields = ["id", "title", "created_at", "updated_at",]
+    ordering_fields = ["id", "title", "no_of_species",
+                       "created_at", "updated_at",]
+    conditional_related = conditional_counted = ("species",)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset
+
+        return queryset.prefetch_related(Prefetch('species', queryset=nested_queryset(
+            PlantSpecies.objects.all(), self.request, 'species', 'genus_id')))
 
     def get_serializer_context(self):
         """
@@ -105,10 +301,17 @@ class PlantGenusViewset(viewsets.ModelViewSet):
 
 
 @method_decorator(csrf_protect, name='dispatch')
+@method_decorator(conditional_response(), name='list')
+@method_decorator(conditional_response(), name='retrieve')
+@method_decorator(cache_response(*FAMILY_LIST_DEPENDENCIES), name='list')
+@method_decorator(cache_response(*FAMILY_DEPENDENCIES), name='retrieve')
 @extend_schema(summary='Plant Family Viewset', tags=['Plant Family'])
-class PlantFamilyViewset(viewsets.ModelViewSet):
+@extend_schema_view(retrieve=extend_schema(
+    parameters=NESTED_LIST_PARAMETERS['genus'] + NESTED_LIST_PARAMETERS['species']))
+class PlantFamilyViewset(ValuesListMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = PlantFamily.objects.all()
     serializer_class = PlantFamilySerializer
+    values_serializer_class = PlantFamilyListValuesSerializer
     permission_classes = (permissions.IsAdminUser, )
     lookup_field = 'slug'
     filter_backends = [
@@ -120,9 +323,29 @@ class PlantFamilyViewset(viewsets.ModelViewSet):
         "id": ["exact"],
         "created_at": ["gte", "lte", "exact", "gt", "lt"],
         "updated_at": ["gte", "lte", "exact", "gt", "lt"],
+        "no_of_plants": ["exact", "gte", "lte", "gt", "lt"],
     }
     search_fields = ["id", "title",]
-    ordering_fields = ["id", "title", "created_at", "updated_at",]
+    ordering_fields = ["id", "title", "no_of_plants",
+                       "created_at", "updated_at",]
+    conditional_related = conditional_counted = (
+        "plants", "genuses", "genuses__species")
+
+    def get_queryset(self):
+        """
+        Build the nested genus and species lists of a family from one prefetch query per
+        level instead of one query per genus.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset
+
+        species = nested_queryset(
+            PlantSpecies.objects.all(), self.request, 'species', 'genus_id')
+        genuses = nested_queryset(PlantGenus.objects.prefetch_related(
+            Prefetch('species', queryset=species)), self.request, 'genus', 'family_id')
+
+        return queryset.prefetch_related(Prefetch('genuses', queryset=genuses))
 
     def get_serializer_context(self):
         """
@@ -151,9 +374,11 @@ class PlantFamilyViewset(viewsets.ModelViewSet):
 
 
 @method_decorator(csrf_protect, name='dispatch')
+@method_decorator(cache_response(*CATALOG_DEPENDENCIES), name='list')
+@method_decorator(cache_response(*CATALOG_DEPENDENCIES), name='retrieve')
 @extend_schema(summary='Plant Image Viewset', tags=['Plant Image'])
 class PlantImageViewset(viewsets.ModelViewSet):
-    queryset = PlantImage.objects.all()
+    queryset = PlantImage.objects.select_related('plant__genus', 'plant__species')
     serializer_class = PlantImageSerializer
     permission_classes = (permissions.IsAdminUser, )
     lookup_field = 'id'
@@ -188,13 +413,29 @@ class PlantImageViewset(viewsets.ModelViewSet):
         return super().get_permissions()
 
 
+@method_decorator(conditional_response(), name='list')
+@method_decorator(conditional_response(), name='retrieve')
+@method_decorator(conditional_response(), name='by_name')
+@method_decorator(conditional_response('get_taxonomy_tree_validators'), name='taxonomy_tree')
+@method_decorator(cache_response(*PLANT_DEPENDENCIES), name='list')
+@method_decorator(cache_response(*PLANT_DEPENDENCIES), name='retrieve')
+@method_decorator(cache_response(*CATALOG_DEPENDENCIES), name='taxonomy_tree')
+@method_decorator(cache_response(*PLANT_DEPENDENCIES), name='by_name')
+@method_decorator(cache_response(*CATALOG_DEPENDENCIES), name='fuzzy_search')
 @extend_schema(summary='Plant List View', tags=['Plant List'])
-class PlantViewset(viewsets.ReadOnlyModelViewSet):
+@extend_schema_view(list=extend_schema(parameters=[
+    OpenApiParameter('images', str, enum=['all', 'default'],
+                     description='Embed only the default image and an image count when set to `default`.'),
+    *PROJECTION_PARAMETERS
+]), retrieve=extend_schema(parameters=PROJECTION_PARAMETERS))
+class PlantViewset(LanguageNegotiationMixin, ValuesListMixin, ConditionalGetMixin,
+                   viewsets.ReadOnlyModelViewSet):
     queryset = Plant.objects.all()
     serializer_class = PlantListSerializer
     permission_classes = (permissions.AllowAny, )
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter,
-                       filters.OrderingFilter,]
+                       PlantFullTextSearchFilter, filters.OrderingFilter,]
 
     search_fields = ["id", "family__title",
                      "common_names", "genus__title", "species__title"]
@@ -202,24 +443,307 @@ class PlantViewset(viewsets.ReadOnlyModelViewSet):
                        "genus__title", "species__title", "created_at", "updated_at",]
 
     filterset_class = PlantFilter
+    conditional_related = ("family", "genus", "species", "images")
+    conditional_counted = ("images",)
+    # Only used by the actions throttled with `ScopedRateThrottle`.
+    throttle_scope = 'autocomplete'
+
+    def embeds_default_image_only(self):
+        return self.action == 'list' and self.request.query_params.get('images') == 'default'
+
+    def get_projected_fields(self):
+        return get_projected_fields(self.request, self.get_serializer_class(),
+                                    self.content_language)
+
+    def get_queryset(self):
+        """
+        Resolve the taxonomy with a single join and fetch the images of the whole page
+        with one extra query, loading only what the projected fields render. The
+        prefetched images get their `plant` cache filled with the already joined plant,
+        so `PlantImageSerializer.plant` costs no query either.
+        """
+        fields = self.get_projected_fields()
+        ordering = filters.OrderingFilter().get_ordering(self.request, self.queryset, self) or ()
+        queryset = project_queryset(super().get_queryset(), fields,
+                                    keep=[name.lstrip('-').split('__')[0] for name in ordering],
+                                    language=self.content_language)
+
+        if self.embeds_default_image_only():
+            if 'no_of_images' in fields:
+                # Meta.ordering is ignored by aggregating queries, which pages need.
+                queryset = queryset.annotate(no_of_images=Count('images', distinct=True)).order_by(
+                    *Plant._meta.ordering)
+            if 'default_image' in fields:
+                queryset = queryset.prefetch_related(
+                    Prefetch('images', queryset=PlantImage.objects.filter(default=True),
+                             to_attr='default_images'))
+
+        return queryset
+
+    def get_values_serializer(self):
+        """
+        Render the full list from `.values()` rows; the compact list keeps the regular
+        serializer for its prefetched default image.
+        """
+        if self.embeds_default_image_only():
+            return None
+
+        return PlantListValuesSerializer(fields=self.get_projected_fields(),
+                                         context=self.get_serializer_context(),
+                                         language=self.content_language)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ('list', 'retrieve', 'by_name'):
+            kwargs.setdefault('fields', self.get_projected_fields())
+            kwargs.setdefault('language', self.content_language)
+
+        return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
-        if self.action == 'retrieve':
+        if self.action in ('retrieve', 'by_name'):
             return PlantDetailsSerializer
 
+        if self.embeds_default_image_only():
+            return PlantCompactListSerializer
+
         return super().get_serializer_class()
 
+    def get_taxonomy_tree_validators(self, request, *args, **kwargs):
+        return get_queryset_validators(request, PlantFamily.objects.all(),
+                                       related=("genuses", "genuses__species", "plants"),
+                                       counted=("genuses", "genuses__species", "plants"))
+
+    @extend_schema(summary='Retrieve Plant By Scientific Name Slug', parameters=PROJECTION_PARAMETERS)
+    @action(detail=False, url_path=r'by-name/(?P<slug>[-\w]+)', lookup_field='slug',
+            pagination_class=None, filter_backends=[])
+    def by_name(self, request, slug):
+        """
+        Retrieve a plant by the slug of its scientific name, e.g. `azadirachta-indica`,
+        with a single probe of the unique slug index.
+        """
+        return Response(self.get_serializer(self.get_object()).data)
 
-class PlantDetailsAPIView(APIView):
+    @extend_schema(summary='Export Plant Catalog', parameters=PROJECTION_PARAMETERS,
+                   responses={(200, 'application/x-ndjson'): PlantListSerializer})
+    @action(detail=False, pagination_class=None, renderer_classes=[FastJSONRenderer, NDJSONRenderer],
+            filter_backends=[DjangoFilterBackend, filters.SearchFilter, PlantFullTextSearchFilter])
+    def export(self, request):
+        """
+        Stream every plant matching the filters as newline delimited JSON, one plant of the
+        plant list per line, in id order. The plants are read through a server side cursor
+        and their images fetched chunk by chunk, so the memory used does not grow with the
+        catalog and no COUNT or OFFSET is run.
+        """
+        serializer = self.get_values_serializer()
+        rows = self.filter_queryset(self.get_queryset()).prefetch_related(None).order_by(
+            'id').values(*serializer.get_lookups())
+        renderer = NDJSONRenderer()
+
+        response = StreamingHttpResponse(
+            (renderer.render(chunk) for chunk in iter_serialized(rows, serializer, EXPORT_CHUNK_SIZE)),
+            content_type=renderer.media_type)
+        response['Content-Disposition'] = 'attachment; filename="plants.ndjson"'
+
+        return response
+
+    @extend_schema(summary='Record Plant Observation', request=None,
+                   responses={202: inline_serializer(
+                       'ObservationRecorded', {'message': serializers.CharField()})})
+    @action(detail=True, methods=['post'], filter_backends=[])
+    def observe(self, request, pk=None):
+        """
+        Count an identification of the plant. The count is buffered and written to
+        `no_of_observations` in batches, so it shows up after the next flush. Only ids of
+        existing plants are buffered, an id the flush can not write would be retried forever.
+        """
+        plant_id = int(pk) if pk.isascii() and pk.isdigit() else 0
+        if not 0 < plant_id <= MAX_ID or not Plant.objects.filter(pk=plant_id).exists():
+            return Response({"message": "Plant not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        record_observation(plant_id)
+        return Response({"message": "Observation recorded"}, status=status.HTTP_202_ACCEPTED)
+
+    @extend_schema(summary='Resolve Plants In Batch', request=PlantResolveRequestSerializer,
+                   responses=PlantResolveResultSerializer(many=True))
+    @action(detail=False, methods=['post'], pagination_class=None, filter_backends=[])
+    def resolve(self, request):
+        """
+        Resolve up to 20 plant ids or scientific names, e.g. the top candidates of an
+        identification, with one query. Results follow the request order; a reference
+        that matches no plant comes back with a null `plant`. `fields` limits the plant
+        fields returned and defaults to those of the plant list.
+        """
+        payload = PlantResolveRequestSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+        references = payload.validated_data['plants']
+        fields = payload.validated_data.get('fields') or PlantListSerializer.Meta.fields
+
+        # Names are matched on the unique slug so that the case of the epithet does not matter.
+        keys = [reference if isinstance(reference, int) else slugify(reference)
+                for reference in references]
+
+        queryset = project_queryset(Plant.objects.filter(
+            Q(pk__in=[key for key in keys if isinstance(key, int)])
+            | Q(slug__in=[key for key in keys if isinstance(key, str)])
+        ), fields, keep=('slug',), language=self.content_language)
+
+        plants = {}
+        for plant in queryset:
+            plants[plant.pk] = plants[plant.slug] = plant
+
+        context = self.get_serializer_context()
+        return Response([
+            {'query': reference,
+             'plant': PlantDetailsSerializer(plants[key], fields=fields,
+                                             language=self.content_language, context=context).data
+             if key in plants else None}
+            for reference, key in zip(references, keys)
+        ])
+
+    @extend_schema(summary='Plant Name Autocomplete', parameters=[AutocompleteQuerySerializer],
+                   responses=AutocompleteSuggestionSerializer(many=True))
+    @action(detail=False, pagination_class=None, filter_backends=[],
+            throttle_classes=[throttling.ScopedRateThrottle])
+    def autocomplete(self, request):
+        """
+        Suggest English and Nepali common names and family, genus and species titles with
+        a word starting with `q`. Served from an in-process index without querying the
+        database, so it is throttled separately to allow a request per keystroke.
+        """
+        query = AutocompleteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        suggestions = plant_names.search(query.validated_data['q'], query.validated_data['limit'])
+
+        return Response(AutocompleteSuggestionSerializer(suggestions, many=True).data)
+
+    @extend_schema(summary='Plant Fuzzy Name Search', parameters=[FuzzySearchQuerySerializer],
+                   responses=PolymorphicProxySerializer(
+                       component_name='FuzzyMatch', resource_type_field_name=None,
+                       serializers=[PlantFuzzyMatchSerializer, TaxonFuzzyMatchSerializer],
+                       many=True))
+    @action(detail=False, url_path='fuzzy-search', pagination_class=None, filter_backends=[])
+    def fuzzy_search(self, request):
+        """
+        Return the plants, or with `kind` the families, genera or species, whose names
+        contain a word similar to `q`, most similar first. Tolerates misspelled Latin names
+        such as "Azadiracta indca".
+        """
+        query = FuzzySearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        kind = query.validated_data['kind']
+
+        if kind == 'plant':
+            queryset = Plant.objects.select_related(
+                'family', 'genus', 'species').defer('search_vector', 'search_names')
+            field, serializer_class = 'search_names', PlantFuzzyMatchSerializer
+        else:
+            queryset = {'family': PlantFamily, 'genus': PlantGenus,
+                        'species': PlantSpecies}[kind].objects.all()
+            field, serializer_class = 'title', TaxonFuzzyMatchSerializer
+
+        matches = find_similar(queryset, field, query.validated_data['q'],
+                               threshold=query.validated_data.get('threshold'),
+                               limit=query.validated_data['limit'])
+
+        return Response(serializer_class(matches, many=True).data)
+
+    @extend_schema(summary='Download Offline Catalog Bundle',
+                   responses={(200, 'application/gzip'): OpenApiTypes.BINARY, 304: None})
+    @action(detail=False, url_path='catalog-bundle', pagination_class=None, filter_backends=[],
+            content_negotiation_class=IgnoreClientContentNegotiation)
+    def catalog_bundle(self, request):
+        """
+        Download the whole catalog as gzip compressed JSON: families, genuses, species and
+        plants with their default image URL. The bundle is rebuilt only after the catalog
+        changed and its ETag is the hash of its content, so clients sending it back in
+        If-None-Match download each version once.
+        """
+        metadata = get_bundle()
+        response = get_conditional_response(request, etag=metadata['etag'])
+        if response is None:
+            metadata, file = open_bundle(metadata)
+            response = FileResponse(file, as_attachment=True, filename='catalog.json.gz',
+                                    content_type='application/gzip')
+            response['ETag'] = metadata['etag']
+        response['Cache-Control'] = 'no-cache'
+
+        return response
+
+    @extend_schema(summary='Sync Catalog Changes', parameters=[CatalogChangesQuerySerializer],
+                   responses={200: CatalogChangesSerializer, 410: inline_serializer(
+                       'CatalogResyncRequired', {'message': serializers.CharField()})})
+    @action(detail=False, pagination_class=None, filter_backends=[])
+    def changes(self, request):
+        """
+        Return what changed in the catalog since the `since` position: the saved rows, in
+        the shape of the catalog bundle, and the ids of the deleted ones. Start from 0, or
+        from the `position` of the catalog bundle, and pass `next` back until `has_more` is
+        false. A 410 response means that the changes since `since` were pruned and that
+        the catalog bundle has to be downloaded again.
+        """
+        query = CatalogChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        if query.validated_data['since'] < get_pruned_position():
+            return Response({"message": "Changes since this position were pruned, "
+                                        "download the catalog bundle again."},
+                            status=status.HTTP_410_GONE)
+
+        return Response(CatalogChangesSerializer(get_catalog_changes(
+            query.validated_data['since'], query.validated_data['limit'])).data)
+
+    @extend_schema(summary='Plant Taxonomy Tree', responses=TaxonomyTreeFamilySerializer(many=True))
+    @action(detail=False, url_path='taxonomy-tree', pagination_class=None, filter_backends=[])
+    def taxonomy_tree(self, request):
+        """
+        Return the whole family -> genus -> species -> plant id hierarchy. Every level is
+        read with a single flat `values_list` query and stitched together in memory.
+        """
+        families = {pk: {"id": pk, "title": title, "slug": slug, "genuses": []}
+                    for pk, title, slug in PlantFamily.objects.values_list('pk', 'title', 'slug')}
+        genuses = {}
+        for pk, title, slug, family_id in PlantGenus.objects.values_list('pk', 'title', 'slug', 'family_id'):
+            genuses[pk] = {"id": pk, "title": title,
+                           "slug": slug, "species": [], "plants": []}
+            families[family_id]["genuses"].append(genuses[pk])
+
+        species = {}
+        for pk, title, slug, genus_id in PlantSpecies.objects.values_list('pk', 'title', 'slug', 'genus_id'):
+            species[pk] = {"id": pk, "title": title,
+                           "slug": slug, "plants": []}
+            genuses[genus_id]["species"].append(species[pk])
+
+        for pk, genus_id, species_id in Plant.objects.order_by('pk').values_list('pk', 'genus_id', 'species_id'):
+            if species_id is not None:
+                species[species_id]["plants"].append(pk)
+            else:
+                genuses[genus_id]["plants"].append(pk)
+
+        return Response(list(families.values()))
+
+
+class PlantDetailsAPIView(LanguageNegotiationMixin, APIView):
     permission_classes = (permissions.AllowAny, )
 
+    def get_queryset(self):
+        scientific_name = ' '.join(
+            filter(None, (self.request.GET.get('genus'), self.request.GET.get('species'))))
+        return Plant.objects.filter(scientific_name=scientific_name)
+
+    def get_validators(self, request, *args, **kwargs):
+        return get_queryset_validators(request, self.get_queryset(),
+                                       related=PlantViewset.conditional_related,
+                                       counted=PlantViewset.conditional_counted)
+
+    @method_decorator(conditional_response())
+    @method_decorator(cache_response(*PLANT_DEPENDENCIES))
     def get(self, request):
-        genus = request.GET.get('genus')
-        species = request.GET.get('species')
-        plant = Plant.objects.filter(
-            genus__title=genus, species__title=species).first()
-        if plant:
-            serializer = PlantDetailsSerializer(plant)
-            return Response(serializer.data)
-        else:
+        fields = get_projected_fields(request, PlantDetailsSerializer, self.content_language)
+        # Scientific names are not unique when a species was deleted, the oldest plant wins.
+        plant = project_queryset(self.get_queryset(), fields,
+                                 language=self.content_language).order_by('pk').first()
+        if plant is None:
             return Response({"message": "Plant not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = PlantDetailsSerializer(plant, fields=fields, language=self.content_language)
+        return Response(serializer.data)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UtilitiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'utilities'
+
+    def ready(self):
+        from . import signals  # noqa: F401
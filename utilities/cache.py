@@ -0,0 +1,106 @@
+import hashlib
+import json
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .language import get_response_language
+from .pagination import KeysetPagination
+
+
+# Parameters whose mere presence changes the response, such as an empty cursor asking for
+# the first keyset page.
+PRESENCE_PARAMS = {KeysetPagination.cursor_query_param}
+
+VERSION_KEY_PREFIX = 'response-cache-version'
+RESPONSE_KEY_PREFIX = 'response-cache'
+
+
+def get_version_key(dependency):
+    return f'{VERSION_KEY_PREFIX}:{dependency}'
+
+
+def get_versions(dependencies):
+    """
+    Return the current version of every dependency. A missing version is seeded with the
+    current time so that it can never collide with a version used before it was evicted.
+    """
+    keys = [get_version_key(dependency) for dependency in dependencies]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_version(dependency):
+    """
+    Invalidate every cached response that depends on `dependency`. The responses are not
+    deleted; their keys simply become unreachable and expire on their own.
+    """
+    key = get_version_key(dependency)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def get_normalized_params(query_params):
+    """
+    Return the query parameters as a sorted list of (name, sorted values) pairs, ignoring
+    empty values but those of `PRESENCE_PARAMS`, so that equivalent query strings share
+    one cache entry.
+    """
+    params = []
+    for name in sorted(query_params.keys()):
+        values = sorted(value for value in query_params.getlist(name) if value != '')
+        if values or name in PRESENCE_PARAMS:
+            params.append((name, values))
+
+    return params
+
+
+def get_response_cache_key(request, dependencies):
+    signature = json.dumps([
+        request.build_absolute_uri(request.path),
+        get_normalized_params(request.GET),
+        get_response_language(request),
+        get_versions(dependencies),
+    ])
+    digest = hashlib.sha256(signature.encode()).hexdigest()
+
+    return f'{RESPONSE_KEY_PREFIX}:{digest}'
+
+
+def cache_response(*dependencies, timeout=None):
+    """
+    Cache the data of successful GET responses, keyed on the absolute path, the normalized
+    query parameters, the negotiated language and the versions of the given dependencies. Meant to be applied with
+    `method_decorator` to DRF view methods.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            key = get_response_cache_key(request, dependencies)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data,
+                          timeout if timeout is not None else settings.RESPONSE_CACHE_TIMEOUT)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,132 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import get_normalized_params
+from .language import get_response_language
+
+
+def get_relation(model, lookup):
+    """
+    Return the model `lookup` leads to from `model` and the lookup leading back.
+    """
+    path = []
+    for name in lookup.split('__'):
+        field = model._meta.get_field(name)
+        path.insert(0, field.field.name if field.auto_created and not field.concrete
+                    else field.related_query_name())
+        model = field.related_model
+
+    return model, '__'.join(path)
+
+
+def get_queryset_validators(request, queryset, related=(), counted=()):
+    """
+    Derive a strong ETag and a Last-Modified date for the response rendering `queryset`
+    from a single aggregate query, without serializing anything.
+
+    Each relation is read with its own correlated subquery per row rather than joined,
+    which would multiply the rows of the relations with one another.
+
+    :param related: relation lookups whose `updated_at` is rendered in the response
+    :param counted: multi-valued relation lookups whose deletions must change the ETag
+    :return: A tuple of (etag, last_modified)
+    """
+    aggregates = {
+        'count': Count('pk', distinct=True),
+        'updated_at': Max('updated_at'),
+    }
+    for lookup, aggregate, name, wrapper in (
+            *((lookup, Max('updated_at'), 'updated_at', Max) for lookup in related),
+            *((lookup, Count('pk'), 'count', Sum) for lookup in counted)):
+        model, reverse = get_relation(queryset.model, lookup)
+        aggregates[f'{lookup}__{name}'] = wrapper(Subquery(
+            model.objects.filter(**{reverse: OuterRef('pk')}).order_by().values(reverse)
+            .annotate(value=aggregate).values('value')))
+
+    values = queryset.order_by().aggregate(**aggregates)
+
+    timestamps = [value for name, value in values.items()
+                  if name.endswith('updated_at') and value is not None]
+    last_modified = max(timestamps) if timestamps else None
+
+    signature = json.dumps([
+        request.build_absolute_uri(request.path),
+        get_normalized_params(request.GET),
+        get_response_language(request),
+        getattr(request, 'accepted_media_type', None),
+        values,
+    ], cls=DjangoJSONEncoder, sort_keys=True)
+    etag = '"%s"' % hashlib.sha256(signature.encode()).hexdigest()
+
+    return etag, last_modified
+
+
+def conditional_response(validators='get_validators'):
+    """
+    Answer GET requests carrying a matching If-None-Match or If-Modified-Since header with
+    304 Not Modified before the view does any serializer work, and send ETag and
+    Last-Modified headers otherwise.
+
+    Meant to be applied with `method_decorator` to DRF view methods. `validators` names the
+    view method returning the (etag, last_modified) tuple of the request.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            view = request.parser_context['view']
+            etag, last_modified = getattr(view, validators)(
+                request, *args, **kwargs)
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp)
+            if response is not None:
+                # The ETag is that of the representation negotiated from Accept.
+                patch_vary_headers(response, ('Accept',))
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                patch_vary_headers(response, ('Accept',))
+                response.headers.setdefault('ETag', etag)
+                if timestamp is not None:
+                    response.headers.setdefault(
+                        'Last-Modified', http_date(timestamp))
+
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class ConditionalGetMixin:
+    """
+    Derive the validators of list and detail responses from the filtered queryset of a
+    generic view. Subclasses list the relations rendered by their serializers.
+    """
+    conditional_related = ()
+    conditional_counted = ()
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.queryset.all())
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+        return queryset
+
+    def get_validators(self, request, *args, **kwargs):
+        return get_queryset_validators(request, self.get_conditional_queryset(),
+                                       self.conditional_related, self.conditional_counted)
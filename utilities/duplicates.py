@@ -0,0 +1,143 @@
+from threading import Lock
+
+import numpy as np
+from django.apps import apps
+
+from .cache import get_versions
+from .models import ImageDetailsMixin
+
+
+def get_image_models():
+    return [model for model in apps.get_models() if issubclass(model, ImageDetailsMixin)]
+
+
+def get_hash_dependency(model):
+    return f'{model._meta.label}.image_hash'
+
+
+def load_hashes():
+    """
+    Return the (model, pk) of every hashed image, across all the models storing images,
+    and their perceptual hashes as an array of unsigned 64 bit integers.
+    """
+    images, hashes = [], []
+    for model in get_image_models():
+        for pk, image_hash in model.objects.exclude(image_hash=None).order_by('pk').values_list(
+                'pk', 'image_hash'):
+            images.append((model, pk))
+            hashes.append(image_hash)
+
+    # The hashes are stored signed; XOR and bit counts want the raw bits.
+    return images, np.array(hashes, dtype=np.int64).view(np.uint64)
+
+
+class HashIndex:
+    """
+    The perceptual hashes of all the images kept in the process memory, so that uploads
+    are compared with them without reading them all from the database. The index is
+    loaded on first use, patched on the image signals and reloaded whenever another
+    process changed the hashes, as told by the versions of `get_hash_dependency`.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.hashes = {}
+        self.arrays = None
+        self.versions = None
+
+    def get(self):
+        """
+        Return the (model, pk) of every hashed image and their hashes as an array of
+        unsigned 64 bit integers, like `load_hashes`.
+        """
+        versions = get_versions([get_hash_dependency(model) for model in get_image_models()])
+        with self.lock:
+            if versions != self.versions:
+                images, hashes = load_hashes()
+                self.hashes = dict(zip(images, hashes.view(np.int64).tolist()))
+                self.arrays = images, hashes
+                self.versions = versions
+            elif self.arrays is None:
+                self.arrays = list(self.hashes), np.fromiter(
+                    self.hashes.values(), dtype=np.int64, count=len(self.hashes)).view(np.uint64)
+
+            return self.arrays
+
+    def refresh(self, model, pk):
+        """
+        Re-read the hash of a changed or deleted image once the change bumped the version
+        of its model. If any other change slipped in meanwhile the index is left stale and
+        gets reloaded on next use.
+        """
+        with self.lock:
+            if self.versions is None:
+                return
+
+            self.hashes.pop((model, pk), None)
+            image_hash = model.objects.filter(pk=pk).values_list('image_hash', flat=True).first()
+            if image_hash is not None:
+                self.hashes[model, pk] = image_hash
+            self.arrays = None
+
+            position = get_image_models().index(model)
+            current = get_versions([get_hash_dependency(model)])[0]
+            if self.versions[position] + 1 == current:
+                self.versions[position] = current
+
+
+image_hashes = HashIndex()
+
+
+def hamming_distances(hashes, image_hash):
+    return np.bitwise_count(hashes ^ np.uint64(image_hash & 0xFFFFFFFFFFFFFFFF))
+
+
+def find_similar_images(image_hash, max_distance):
+    """
+    Return the (model, pk, distance) of the images whose perceptual hash is at most
+    `max_distance` bits away from `image_hash`, closest first.
+
+    Exact copies are looked up with the index of the hash column. Near ones are found by
+    comparing the hash with all the others at once, held in memory by `image_hashes`,
+    which takes well under a millisecond per ten thousand images.
+    """
+    if max_distance == 0:
+        return [(model, pk, 0) for model in get_image_models()
+                for pk in model.objects.filter(image_hash=image_hash).values_list('pk', flat=True)]
+
+    images, hashes = image_hashes.get()
+    distances = hamming_distances(hashes, image_hash)
+    similar = np.flatnonzero(distances <= max_distance)
+
+    return [(*images[index], int(distances[index]))
+            for index in similar[np.argsort(distances[similar], kind='stable')]]
+
+
+def find_duplicate_groups(max_distance):
+    """
+    Return the groups of images whose perceptual hashes are at most `max_distance` bits
+    apart, transitively, as lists of (model, pk), largest groups first.
+    """
+    images, hashes = image_hashes.get()
+    # Union-find over the pairs of near images, each hash being compared with all the
+    # following ones in a single vectorized operation.
+    parents = np.arange(len(hashes))
+
+    def find(index):
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    for index in range(len(hashes) - 1):
+        near = np.flatnonzero(hamming_distances(hashes[index + 1:], int(hashes[index]))
+                              <= max_distance) + index + 1
+        for other in near:
+            parents[find(other)] = find(index)
+
+    groups = {}
+    for index, image in enumerate(images):
+        groups.setdefault(find(index), []).append(image)
+
+    return sorted((group for group in groups.values() if len(group) > 1),
+                  key=len, reverse=True)
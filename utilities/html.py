@@ -0,0 +1,173 @@
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+
+# Tags kept by `clean_html`, with their allowed attributes. CKEditor 5 writes no others
+# that carry meaning; other tags are unwrapped and their content kept.
+ALLOWED_TAGS = {
+    'p': (), 'br': (), 'hr': (), 'blockquote': (), 'pre': (), 'code': (),
+    'h1': (), 'h2': (), 'h3': (), 'h4': (), 'h5': (), 'h6': (),
+    'strong': (), 'b': (), 'em': (), 'i': (), 'u': (), 's': (), 'sub': (), 'sup': (),
+    'mark': (), 'ul': (), 'ol': ('start', 'reversed'), 'li': (),
+    'a': ('href', 'title', 'target', 'rel'),
+    'figure': ('class',), 'figcaption': (), 'img': ('src', 'alt', 'width', 'height'),
+    'oembed': ('url',),
+    'table': (), 'thead': (), 'tbody': (), 'tfoot': (), 'tr': (),
+    'th': ('colspan', 'rowspan', 'scope'), 'td': ('colspan', 'rowspan'),
+}
+# Tags removed along with their content.
+DROPPED_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript',
+                'head', 'title', 'svg', 'math'}
+VOID_TAGS = {'br', 'hr', 'img', 'wbr'}
+URL_ATTRIBUTES = {'href', 'src', 'url'}
+URL_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+# Tags ending a line of the plain text.
+BLOCK_TAGS = {'p', 'br', 'hr', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+              'ul', 'ol', 'li', 'figure', 'figcaption', 'table', 'tr', 'div'}
+
+EXCERPT_LENGTH = 200
+
+# Collapsible whitespace, which unlike `\s` leaves out the non-breaking space.
+whitespace = re.compile(r'[ \t\n\r\f]+')
+
+
+def is_safe_url(value):
+    # Browsers ignore control characters and spaces in schemes, e.g. "java\tscript:".
+    value = re.sub(r'[\x00-\x20]+', '', value)
+    try:
+        return urlsplit(value).scheme.lower() in URL_SCHEMES
+    except ValueError:
+        return False
+
+
+class HTMLCleaner(HTMLParser):
+    """
+    Rebuild HTML from the allowed tags and attributes only, balanced, without comments
+    and with the whitespace collapsed outside of <pre>. Collects the plain text on the
+    way.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.open_tags = []
+        self.dropping = 0
+        self.preformatted = 0
+        # Whether the last thing written is a block tag, around which spaces are not rendered.
+        self.after_block = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            if tag not in VOID_TAGS:
+                self.dropping += 1
+            return
+        if self.dropping:
+            return
+
+        if tag in BLOCK_TAGS:
+            self.text.append('\n')
+        if tag not in ALLOWED_TAGS:
+            return
+
+        attributes = ''.join(
+            f' {name}="{escape(value or "", quote=True)}"' for name, value in attrs
+            if name in ALLOWED_TAGS[tag]
+            and (name not in URL_ATTRIBUTES or is_safe_url(value or '')))
+        self.write_tag(tag, f'<{tag}{attributes}>')
+
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+            if tag == 'pre':
+                self.preformatted += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping:
+            return
+
+        if tag in BLOCK_TAGS:
+            self.text.append('\n')
+        if tag in self.open_tags:
+            # Close the tags left open inside, so that the output stays balanced.
+            while self.open_tags:
+                closed = self.open_tags.pop()
+                self.close_tag(closed)
+                if closed == tag:
+                    break
+
+    def close_tag(self, tag):
+        self.write_tag(tag, f'</{tag}>')
+        if tag == 'pre':
+            self.preformatted -= 1
+
+    def write_tag(self, tag, markup):
+        block = tag in BLOCK_TAGS
+        if block and not self.preformatted and self.html and not self.html[-1].startswith('<'):
+            self.html[-1] = self.html[-1].rstrip(' ')
+        self.html.append(markup)
+        self.after_block = block
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+
+        if not self.preformatted:
+            data = whitespace.sub(' ', data)
+            if self.after_block:
+                data = data.lstrip(' ')
+            if not data:
+                return
+
+        self.html.append(escape(data, quote=False))
+        self.text.append(data)
+        self.after_block = False
+
+    def get_html(self):
+        while self.open_tags:
+            self.close_tag(self.open_tags.pop())
+
+        return ''.join(self.html).strip()
+
+    def get_text(self):
+        lines = (' '.join(line.split()) for line in ''.join(self.text).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+
+def clean_html(value):
+    """
+    Return the sanitized and minified HTML of `value` and its plain text, one line per
+    block. Inline styles, classes (but on figures), scripts, event handlers and unsafe
+    URLs are removed.
+    """
+    cleaner = HTMLCleaner()
+    cleaner.feed(value or '')
+    cleaner.close()
+
+    return cleaner.get_html(), cleaner.get_text()
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """
+    Return the first `length` characters of `text` on a single line, cut on a word
+    boundary with an ellipsis.
+    """
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+
+    # Leave room for the ellipsis and drop the word cut in two, unless it is the only one.
+    excerpt = text[:length - 1]
+    if text[length - 1] != ' ' and ' ' in excerpt:
+        excerpt = excerpt.rsplit(' ', 1)[0]
+
+    return f'{excerpt.rstrip()}…'
@@ -0,0 +1,279 @@
+import contextlib
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+import numpy as np
+from PIL import ExifTags, Image, ImageOps
+
+
+# Widths of the variants generated from every uploaded image, in pixels.
+VARIANT_WIDTHS = (320, 640, 1280)
+# Formats of the variants with their Pillow save options, best first so that clients pick
+# the first one they support.
+VARIANT_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+# EXIF orientations swapping the width and height of the image.
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def probe_image(file):
+    """
+    Return the (format, width, height) of the image `file`, read from its header without
+    decoding the image. The file is left as `open_image` leaves it.
+    """
+    owned = file.closed
+    if owned:
+        file.open('rb')
+    else:
+        file.seek(0)
+    try:
+        # Pillow reads no further than the header until the pixels are accessed.
+        with Image.open(file) as image:
+            return (image.format, *image.size)
+    finally:
+        if owned:
+            file.close()
+        else:
+            file.seek(0)
+
+
+def open_image(file, size):
+    """
+    Decode the image of `file` upright, following its EXIF orientation, and return it
+    with its full size. JPEGs may be decoded scaled down, no smaller than `size`.
+
+    A file already open, such as an upload not saved yet, is read from its start and left
+    open; others are opened and closed.
+    """
+    owned = file.closed
+    if owned:
+        file.open('rb')
+    else:
+        file.seek(0)
+    try:
+        image = Image.open(file)
+        width, height = image.size
+        if image.getexif().get(ExifTags.Base.Orientation) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        # Let the JPEG decoder scale down by up to 8 while reading, which is much faster
+        # than decoding the full size only to resize it afterwards.
+        image.draft('RGB', size)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    finally:
+        if owned:
+            file.close()
+        else:
+            file.seek(0)
+
+    return image, (width, height)
+
+
+def flatten(image, mode):
+    """
+    Convert `image` to `mode`, pasting transparent images onto white.
+    """
+    if image.mode == mode:
+        return image
+    if image.mode in ('RGBA', 'LA', 'P') and mode == 'RGB':
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+
+    return image.convert(mode)
+
+
+def resize_image(image):
+    """
+    Yield the (width, image) of each variant width narrower than `image`, widest first,
+    or of the image itself if it is narrower than all of them. Images are never upscaled.
+    """
+    widths = sorted((width for width in VARIANT_WIDTHS if width < image.width), reverse=True)
+    if not widths:
+        yield image.width, image
+        return
+
+    for width in widths:
+        height = max(round(image.height * width / image.width), 1)
+        # Each variant is reduced from the previous, wider one, which costs a fraction of
+        # resampling the original again.
+        image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        yield width, image
+
+
+def get_variant_name(name, width, extension):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+
+    return posixpath.join(directory, 'variants', f'{stem}-{width}w.{extension}')
+
+
+def generate_variants(file):
+    """
+    Save the fixed width variants of the image `file` next to it in its storage, and
+    return their descriptions: a list of {'format', 'width', 'height', 'name'} dicts.
+    """
+    image, _ = open_image(file, (max(VARIANT_WIDTHS),) * 2)
+    mode = 'RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB'
+    image = flatten(image, mode)
+
+    variants = []
+    for width, resized in resize_image(image):
+        for extension, options in VARIANT_FORMATS.items():
+            content = io.BytesIO()
+            # JPEG has no alpha channel.
+            flatten(resized, 'RGB' if options['format'] == 'JPEG' else mode).save(
+                content, **options)
+            name = file.storage.save(get_variant_name(file.name, width, extension),
+                                     ContentFile(content.getvalue()))
+            variants.append({'format': extension, 'width': width,
+                             'height': resized.height, 'name': name})
+
+    return variants
+
+
+def delete_variants(storage, variants):
+    for variant in variants:
+        with contextlib.suppress(Exception):
+            storage.delete(variant['name'])
+
+
+def represent_srcset(url):
+    """
+    Return a converter rendering stored variants as a `srcset` attribute per format, with
+    `url` rendering a file name as its URL.
+    """
+    def convert(variants):
+        srcset = {}
+        for variant in sorted(variants, key=lambda variant: variant['width']):
+            srcset.setdefault(variant['format'], []).append(
+                f"{url(variant['name'])} {variant['width']}w")
+
+        return {extension: ', '.join(srcset[extension])
+                for extension in VARIANT_FORMATS if extension in srcset}
+
+    return convert
+
+
+# Size to which images are reduced before computing their placeholder, which only holds
+# a few low frequencies of the image anyway.
+PLACEHOLDER_SIZE = 32
+BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+
+
+def encode_base83(value, length):
+    return ''.join(BASE83[value // 83 ** (length - i - 1) % 83] for i in range(length))
+
+
+def srgb_to_linear(values):
+    values = values / 255
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(values):
+    values = np.clip(values, 0, 1)
+    values = np.where(values <= 0.0031308, values * 12.92, 1.055 * values ** (1 / 2.4) - 0.055)
+    return np.trunc(values * 255 + 0.5).astype(int)
+
+
+def encode_blurhash(pixels, x_components, y_components):
+    """
+    Return the BlurHash (https://blurha.sh) of the (height, width, 3) sRGB array `pixels`,
+    with the DCT computed as a single tensor contraction rather than per pixel.
+    """
+    height, width, _ = pixels.shape
+    linear = srgb_to_linear(pixels.astype(float))
+    basis_x = np.cos(np.pi * np.outer(np.arange(x_components), np.arange(width)) / width)
+    basis_y = np.cos(np.pi * np.outer(np.arange(y_components), np.arange(height)) / height)
+    factors = np.einsum('jy,ix,yxc->jic', basis_y, basis_x, linear) * 2 / (width * height)
+    factors[0, 0] /= 2
+    factors = factors.reshape(-1, 3)
+    dc, ac = factors[0], factors[1:]
+
+    blurhash = encode_base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if len(ac):
+        quantised_maximum = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        maximum = (quantised_maximum + 1) / 166
+    else:
+        quantised_maximum, maximum = 0, 1
+    blurhash += encode_base83(quantised_maximum, 1)
+
+    red, green, blue = linear_to_srgb(dc)
+    blurhash += encode_base83((red << 16) + (green << 8) + blue, 4)
+
+    ac = ac / maximum
+    quantised = np.clip(np.floor(np.sign(ac) * np.abs(ac) ** 0.5 * 9 + 9.5), 0, 18).astype(int)
+    for red, green, blue in quantised:
+        blurhash += encode_base83(red * 19 * 19 + green * 19 + blue, 2)
+
+    return blurhash
+
+
+def get_dominant_color(pixels):
+    """
+    Return the '#rrggbb' mean colour of the most common of the 4096 colour buckets of the
+    (height, width, 3) array `pixels`.
+    """
+    pixels = pixels.reshape(-1, 3).astype(int)
+    buckets = (pixels[:, 0] >> 4 << 8) | (pixels[:, 1] >> 4 << 4) | (pixels[:, 2] >> 4)
+    dominant = buckets == np.bincount(buckets).argmax()
+    red, green, blue = np.rint(pixels[dominant].mean(axis=0)).astype(int)
+
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+# Side of the grayscale image whose DCT gives the perceptual hash, and of the block of
+# lowest frequencies kept, which makes a 64 bit hash.
+HASH_IMAGE_SIZE = 32
+HASH_SIZE = 8
+
+
+def get_dct_matrix(size):
+    frequencies, positions = np.ogrid[:size, :size]
+    return np.cos(np.pi * (2 * positions + 1) * frequencies / (2 * size))
+
+
+DCT_MATRIX = get_dct_matrix(HASH_IMAGE_SIZE)
+
+
+def perceptual_hash(image):
+    """
+    Return the 64 bit pHash of `image` as a signed integer, the type of a bigint column:
+    the bits tell which of the lowest DCT frequencies of the image, reduced to grayscale,
+    are above their median. Copies of an image resized, recompressed or slightly edited
+    hash within a few bits of each other.
+    """
+    pixels = np.asarray(image.convert('L').resize(
+        (HASH_IMAGE_SIZE, HASH_IMAGE_SIZE), Image.Resampling.LANCZOS), dtype=float)
+    frequencies = (DCT_MATRIX @ pixels @ DCT_MATRIX.T)[:HASH_SIZE, :HASH_SIZE]
+    bits = np.packbits(frequencies > np.median(frequencies))
+
+    return int(bits.view('>i8')[0])
+
+
+def hash_image(file):
+    image, _ = open_image(file, (HASH_IMAGE_SIZE,) * 2)
+    return perceptual_hash(flatten(image, 'RGB'))
+
+
+def describe_image(file):
+    """
+    Return the (width, height, BlurHash placeholder, dominant colour, perceptual hash) of
+    the image `file`, the size being the one it is displayed with.
+    """
+    image, (width, height) = open_image(file, (PLACEHOLDER_SIZE,) * 2)
+    image = flatten(image, 'RGB')
+    image_hash = perceptual_hash(image)
+    image.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    pixels = np.asarray(image)
+
+    # More components along the longer side keep the placeholder cells roughly square.
+    components = (4, 3) if width >= height else (3, 4)
+
+    return (width, height, encode_blurhash(pixels, *components), get_dominant_color(pixels),
+            image_hash)
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import ValidationError
+
+
+ALL_LANGUAGES = 'all'
+
+
+def get_content_language(request):
+    """
+    Negotiate the language of the content from the `lang` query parameter, then from the
+    Accept-Language header. Return None, meaning every language, when the client asks for
+    `lang=all` or expresses no preference.
+    """
+    languages = [code for code, name in settings.LANGUAGES]
+
+    language = request.GET.get('lang')
+    if language:
+        if language == ALL_LANGUAGES:
+            return None
+        if language not in languages:
+            raise ValidationError(
+                {"message": f"lang must be one of {', '.join(languages + [ALL_LANGUAGES])}."})
+        return language
+
+    if 'HTTP_ACCEPT_LANGUAGE' not in request.META:
+        return None
+
+    return translation.get_supported_language_variant(
+        translation.get_language_from_request(request))
+
+
+def get_response_language(request):
+    """
+    Return the content language negotiated by the view handling `request`, so that the
+    cached responses and validators of each language are kept apart.
+    """
+    view = getattr(request, 'parser_context', {}).get('view')
+    return getattr(view, 'content_language', None)
+
+
+class LanguageNegotiationMixin:
+    """
+    Negotiate `content_language` before the handler runs and tell caches that responses
+    vary with the Accept-Language header.
+    """
+    content_language = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.content_language = get_content_language(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ('Accept-Language',))
+        if self.content_language is not None:
+            response.headers.setdefault('Content-Language', self.content_language)
+
+        return response
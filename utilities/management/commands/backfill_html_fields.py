@@ -0,0 +1,31 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from utilities.models import CleanHTMLMixin
+
+
+class Command(BaseCommand):
+    help = ('Sanitize the rich text fields of the existing rows and fill their plain text and '
+            'excerpt columns. Rows are saved one by one so that their save signals run.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Number of rows read from the database at a time.')
+
+    def handle(self, *args, **options):
+        for model in apps.get_models():
+            if not issubclass(model, CleanHTMLMixin):
+                continue
+
+            updated = 0
+            for instance in model.objects.order_by('pk').iterator(chunk_size=options['chunk_size']):
+                names = instance.get_html_field_names()
+                values = [getattr(instance, name) for name in names]
+                instance.clean_html_fields()
+                if [getattr(instance, name) for name in names] != values:
+                    # Bump updated_at too, the ETags of the responses are derived from it.
+                    instance.save(update_fields=[*names, 'updated_at'])
+                    updated += 1
+
+            self.stdout.write(self.style.SUCCESS(
+                f'Cleaned {updated} {model._meta.verbose_name_plural}.'))
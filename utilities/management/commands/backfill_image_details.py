@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from utilities.images import describe_image
+from utilities.models import ImageDetailsMixin
+
+
+def describe(instance):
+    try:
+        return describe_image(instance.image), None
+    except Exception as error:
+        return None, error
+
+
+class Command(BaseCommand):
+    help = ('Compute the size, placeholder, dominant colour and perceptual hash of the images '
+            'uploaded before they were computed on upload, or of every image with --force.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Recompute the details of the images which have some.')
+        parser.add_argument('--workers', type=int, default=8,
+                            help='Number of images fetched and decoded concurrently.')
+        parser.add_argument('--chunk-size', type=int, default=100,
+                            help='Number of rows read from the database at a time.')
+
+    def handle(self, *args, **options):
+        # Threads are enough: the time goes into reading the files from the storage and into
+        # Pillow and NumPy, which release the GIL.
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for model in apps.get_models():
+                if issubclass(model, ImageDetailsMixin):
+                    self.backfill(model, executor, options)
+
+    def backfill(self, model, executor, options):
+        instances = model.objects.exclude(image='').order_by('pk')
+        if not options['force']:
+            instances = instances.filter(Q(image_placeholder='') | Q(image_hash=None))
+        instances = instances.iterator(chunk_size=options['chunk_size'])
+
+        updated = failed = 0
+        while chunk := list(islice(instances, options['chunk_size'])):
+            for instance, (details, error) in zip(chunk, executor.map(describe, chunk)):
+                if error is not None:
+                    failed += 1
+                    self.stderr.write(f'{instance.image.name}: {error}')
+                    continue
+
+                for name, value in zip(instance.image_details, details):
+                    setattr(instance, name, value)
+                # Bump updated_at too, the ETags of the responses are derived from it.
+                instance.save(update_fields=[*instance.image_details, 'updated_at'])
+                updated += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Described the images of {updated} {model._meta.verbose_name_plural}, '
+            f'{failed} failed.'))
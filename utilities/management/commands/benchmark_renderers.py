@@ -0,0 +1,94 @@
+import io
+import time
+from itertools import cycle, islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from plant.models import Plant
+from plant.serializers import PlantListSerializer
+from userprofile.serializers import UserProfileSerializer
+from utilities.parsers import FastJSONParser
+from utilities.renderers import FastJSONRenderer, orjson
+
+
+def get_payloads(size):
+    """
+    Return the (name, data) of a plant list page of `size` plants, repeated to fill the
+    page if need be, and of a user profile.
+    """
+    context = {'request': RequestFactory().get('/')}
+    payloads = []
+
+    plants = list(Plant.objects.select_related('family', 'genus', 'species').prefetch_related(
+        'images').order_by('pk'))
+    if plants:
+        payloads.append((f'plant list ({size})', PlantListSerializer(
+            list(islice(cycle(plants), size)), many=True, context=context).data))
+
+    user = get_user_model().objects.select_related('profile').order_by('pk').first()
+    if user is not None:
+        payloads.append(('profile', UserProfileSerializer(user, context=context).data))
+
+    return payloads
+
+
+def measure(function, number, repeat):
+    """
+    Return the result of `function` and its best mean running time over `number` calls, in
+    microseconds.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            result = function()
+        elapsed = (time.perf_counter() - started) * 1e6 / number
+        best = elapsed if best is None else min(best, elapsed)
+
+    return result, best
+
+
+class Command(BaseCommand):
+    help = ('Compare the time taken to render and parse the plant list and profile payloads '
+            "with DRF's JSON renderer and parser and with the fast ones.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=100,
+                            help='Number of plants in the plant list page.')
+        parser.add_argument('--number', type=int, default=100,
+                            help='Number of calls per run.')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of runs of which the fastest is kept.')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson is not installed, the fast renderer and parser use the json module.'))
+
+        number, repeat = options['number'], options['repeat']
+        for name, data in get_payloads(options['size']):
+            content, render_time = measure(lambda: JSONRenderer().render(data), number, repeat)
+            fast_content, fast_render_time = measure(
+                lambda: FastJSONRenderer().render(data), number, repeat)
+            if content != fast_content:
+                raise CommandError(f'{name}: the rendered JSON differs.')
+
+            parsed, parse_time = measure(
+                lambda: JSONParser().parse(io.BytesIO(content)), number, repeat)
+            fast_parsed, fast_parse_time = measure(
+                lambda: FastJSONParser().parse(io.BytesIO(content)), number, repeat)
+            if parsed != fast_parsed:
+                raise CommandError(f'{name}: the parsed JSON differs.')
+
+            self.stdout.write(
+                f'{name} ({len(content)} bytes): '
+                f'render {render_time:.1f} -> {fast_render_time:.1f} us '
+                f'({render_time / fast_render_time:.1f}x), '
+                f'parse {parse_time:.1f} -> {fast_parse_time:.1f} us '
+                f'({parse_time / fast_parse_time:.1f}x)')
+
+        self.stdout.write(self.style.SUCCESS('Both renderers and parsers gave the same results.'))
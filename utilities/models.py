@@ -1,6 +1,9 @@
 from django.db import models
 from django.utils import timezone
 
+from .html import clean_html, make_excerpt
+from .images import describe_image
+
 
 class TimeStamp(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -22,3 +25,60 @@ class EditableTimeStamp(models.Model):
             self.created_at = timezone.now()
         self.updated_at = timezone.now()
         return super().save(*args, **kwargs)
+
+
+class CleanHTMLMixin:
+    """
+    Sanitize and minify the rich text fields listed in `html_fields` on save, and store
+    their plain text and a short excerpt in the columns it maps each field to, e.g.
+    `{'description': ('description_text', 'description_excerpt')}`.
+    """
+    html_fields = {}
+
+    def clean_html_fields(self):
+        for name, (text_name, excerpt_name) in self.html_fields.items():
+            html, text = clean_html(getattr(self, name))
+            setattr(self, name, html)
+            setattr(self, text_name, text)
+            setattr(self, excerpt_name, make_excerpt(text))
+
+    def get_html_field_names(self):
+        """
+        Return every column written by `clean_html_fields`.
+        """
+        return [column for name, columns in self.html_fields.items()
+                for column in (name, *columns)]
+
+    def save(self, *args, **kwargs):
+        self.clean_html_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields, *(column for name, columns in self.html_fields.items()
+                                  if name in update_fields for column in columns)}
+
+        return super().save(*args, **kwargs)
+
+
+class ImageDetailsMixin:
+    """
+    Store the displayed width and height, a BlurHash placeholder, the dominant colour and
+    the perceptual hash of the `image` field in the `image_details` columns when an image
+    is uploaded. The first ones let clients lay out and paint images before fetching them,
+    the hash finds copies of an image, see `utilities.duplicates`.
+    """
+    image_details = ('image_width', 'image_height', 'image_placeholder', 'image_color',
+                     'image_hash')
+
+    def update_image_details(self):
+        for name, value in zip(self.image_details, describe_image(self.image)):
+            setattr(self, name, value)
+
+    def save(self, *args, **kwargs):
+        if self.image and not self.image._committed:
+            self.update_image_details()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'image' in update_fields:
+                kwargs['update_fields'] = {*update_fields, *self.image_details}
+
+        return super().save(*args, **kwargs)
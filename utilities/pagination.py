@@ -0,0 +1,229 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.contrib.postgres.fields import ArrayField
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, Value
+from django.db.models.functions import Cast
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Largest value of a bigint primary key.
+MAX_ID = 2 ** 63 - 1
+
+
+def encode_cursor_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        # Keep the microseconds, a truncated position would skip or repeat rows.
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} can not be stored in a cursor.')
+
+
+def resolve_field(model, path):
+    """
+    Return the field reached by the lookup `path` (e.g. `species__title`) and whether its
+    value can be NULL because of a nullable field on the way.
+    """
+    field, nullable = None, False
+    for name in path.split('__'):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None, True
+        nullable = nullable or field.null
+        model = field.related_model
+
+    return field, nullable
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with an opt-in keyset mode.
+
+    Sending the `cursor` query parameter (empty for the first page) switches to keyset
+    pagination: pages are fetched with a `(sort key, id) > (value, id)` condition built from
+    the first ordering field of the queryset, so that page N costs the same as page 1 and no
+    COUNT(*) is run. The tie-break on `id` keeps pages stable for every `OrderingFilter`
+    field, including non unique and nullable ones.
+    """
+    cursor_query_param = 'cursor'
+    cursor_query_description = 'Opt into keyset pagination. Send it empty for the first page.'
+    invalid_cursor_message = 'Invalid cursor'
+
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            self.keyset = False
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset = True
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.key, descending = self.get_ordering(queryset)
+        self.field, self.nullable = resolve_field(queryset.model, self.key)
+        value, pk, self.reverse = self.decode_cursor(request)
+        is_first_page = pk is None
+
+        # Walking backwards flips the direction, and with it where NULLs are sorted.
+        descending = descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.key}', f'{prefix}id')
+        if pk is not None:
+            # Cursors come from clients: a forged value must not reach the database.
+            try:
+                value = self.clean_cursor_value(value)
+                queryset = queryset.filter(
+                    self.get_position_filter(value, pk, descending))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if self.reverse:
+            results.reverse()
+
+        if self.reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, not is_first_page
+        self.page = results
+
+        return results
+
+    def get_ordering(self, queryset):
+        ordering = queryset.query.order_by or queryset.model._meta.ordering or ('-id',)
+        field = ordering[0]
+        if not isinstance(field, str):
+            raise NotFound('Keyset pagination needs a plain field ordering.')
+
+        key = field.lstrip('-')
+        if key == 'pk':
+            key = 'id'
+
+        return key, field.startswith('-')
+
+    def clean_cursor_value(self, value):
+        """
+        Convert the value of the cursor to the type of the sort key and check that it fits
+        its column, e.g. an integer within the range of its database type.
+        """
+        if value is None or self.field is None:
+            return value
+
+        value = self.field.to_python(value)
+        self.field.run_validators(value)
+        return value
+
+    def get_position_filter(self, value, pk, descending):
+        """
+        Select the rows after `(value, pk)`. PostgreSQL sorts NULLs last in ascending order
+        and first in descending order, which the NULL branches mirror.
+        """
+        key = self.key
+        if key == 'id':
+            return Q(id__lt=pk) if descending else Q(id__gt=pk)
+
+        if value is None:
+            if descending:
+                return Q(**{f'{key}__isnull': True, 'id__lt': pk}) | Q(**{f'{key}__isnull': False})
+            return Q(**{f'{key}__isnull': True, 'id__gt': pk})
+
+        if isinstance(self.field, ArrayField):
+            # Array parameters are sent as text[], which has no operators against varchar[].
+            value = Cast(Value(value), output_field=self.field)
+
+        if descending:
+            return Q(**{f'{key}__lt': value}) | Q(**{key: value, 'id__lt': pk})
+
+        position = Q(**{f'{key}__gt': value}) | Q(**{key: value, 'id__gt': pk})
+        if self.nullable:
+            position |= Q(**{f'{key}__isnull': True})
+
+        return position
+
+    def get_position(self, obj):
+        if isinstance(obj, dict):
+            # A `.values()` row, which holds the sort key under its lookup.
+            return obj.get(self.key), obj['id']
+
+        value = obj
+        for name in self.key.split('__'):
+            value = getattr(value, name, None)
+            if value is None:
+                break
+
+        return value, obj.pk
+
+    def decode_cursor(self, request):
+        """
+        Return the (value, id, reverse) position stored in the cursor, with a None id for the
+        first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None, False
+
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            pk = int(position['id'])
+            if not 0 < pk <= MAX_ID:
+                raise ValueError(pk)
+            return position['v'], pk, bool(position.get('r', False))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, obj, reverse):
+        value, pk = self.get_position(obj)
+        position = json.dumps(
+            {'v': value, 'id': pk, 'r': reverse}, default=encode_cursor_value)
+        encoded = base64.urlsafe_b64encode(position.encode()).decode()
+
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': self.cursor_query_description,
+            'schema': {
+                'type': 'string',
+            },
+        })
+        return parameters
@@ -0,0 +1,90 @@
+import msgpack
+from django_countries.fields import Country
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """
+    DRF's encoder, which also knows the `Country` values of `django_countries` fields.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, Country):
+            return obj.code
+
+        return super().default(obj)
+
+
+encoder = JSONEncoder()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    Render JSON with orjson when it is installed, falling back to the stdlib `json` module
+    otherwise or when the client asks for an indentation orjson does not support.
+
+    The output is the one of DRF's `JSONRenderer`: compact, UTF-8, with U+2028 and U+2029
+    escaped. Datetimes and every type orjson does not know are handed to `JSONEncoder`, so
+    they render as with DRF (e.g. `Z` for UTC, Decimal as a number, lazy strings forced).
+    """
+    encoder_class = JSONEncoder
+    options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or not self.compact or self.ensure_ascii
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        try:
+            ret = orjson.dumps(data, default=encoder.default, option=self.options)
+        except orjson.JSONEncodeError:
+            # E.g. integers over 64 bits, which the stdlib encoder handles.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Like DRF, escape the line and paragraph separators, which are not valid in JS.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Render the data of the JSON responses as MessagePack, a more compact binary encoding
+    of the same schema for clients on slow links. Values MessagePack has no type for are
+    converted by `JSONEncoder`, e.g. datetimes are the same strings as in JSON.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        return msgpack.packb(data, default=encoder.default, use_bin_type=True)
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    Render a list as newline delimited JSON, one item per line, and anything else as a
+    single line. Lets streaming endpoints negotiate `application/x-ndjson`, and render
+    their errors in it.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        render = super().render
+        items = data if isinstance(data, list) else [data]
+        return b''.join(render(item, None, renderer_context) + b'\n' for item in items)
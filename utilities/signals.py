@@ -0,0 +1,30 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .cache import bump_version
+from .duplicates import get_hash_dependency, get_image_models, image_hashes
+
+
+def refresh_image_hash(model, pk):
+    bump_version(get_hash_dependency(model))
+    image_hashes.refresh(model, pk)
+
+
+def update_image_hashes(sender, instance, update_fields=None, **kwargs):
+    """
+    Have the in-memory hashes of every process updated once the change is committed.
+    Saves leaving the hash untouched are skipped.
+    """
+    if update_fields is not None and 'image_hash' not in update_fields:
+        return
+
+    transaction.on_commit(partial(refresh_image_hash, sender, instance.pk))
+
+
+for model in get_image_models():
+    post_save.connect(update_image_hashes, sender=model,
+                      dispatch_uid=f'update_image_hashes_{model._meta.label}_on_save')
+    post_delete.connect(update_image_hashes, sender=model,
+                        dispatch_uid=f'update_image_hashes_{model._meta.label}_on_delete')
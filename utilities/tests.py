@@ -1,3 +1,75 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from .html import clean_html, is_safe_url, make_excerpt
+
+
+class CleanHTMLTests(SimpleTestCase):
+
+    def test_script_and_style_are_removed_with_their_content(self):
+        html, text = clean_html('<p>Neem</p><script>alert(1)</script>'
+                                '<style>p { color: red }</style><p>leaves</p>')
+
+        self.assertEqual(html, '<p>Neem</p><p>leaves</p>')
+        self.assertEqual(text, 'Neem\nleaves')
+
+    def test_javascript_urls_are_removed(self):
+        for href in ('javascript:alert(1)', 'JavaScript:alert(1)', 'java\tscript:alert(1)',
+                     ' javascript:alert(1)', 'java&#x09;script:alert(1)'):
+            with self.subTest(href=href):
+                html, _ = clean_html(f'<a href="{href}">link</a>')
+                self.assertEqual(html, '<a>link</a>')
+
+    def test_safe_urls_are_kept(self):
+        html, _ = clean_html('<a href="https://example.com/?a=1&amp;b=2" title="Site">link</a>')
+
+        self.assertEqual(html, '<a href="https://example.com/?a=1&amp;b=2" title="Site">link</a>')
+
+    def test_event_handlers_and_styles_are_removed(self):
+        html, _ = clean_html('<p onclick="alert(1)" style="color: red">Tulsi'
+                             '<img src="x.jpg" onerror="alert(1)" alt="Tulsi"></p>')
+
+        self.assertEqual(html, '<p>Tulsi<img src="x.jpg" alt="Tulsi"></p>')
+
+    def test_unbalanced_tags_are_balanced(self):
+        self.assertEqual(clean_html('<p><strong>bold <em>both</p>')[0],
+                         '<p><strong>bold <em>both</em></strong></p>')
+        self.assertEqual(clean_html('<ul><li>one</ul>')[0], '<ul><li>one</li></ul>')
+        self.assertEqual(clean_html('text</em></p>')[0], 'text')
+
+    def test_whitespace_is_kept_inside_pre(self):
+        html, _ = clean_html('<p>  a \n  b  </p>\n<pre>  a \n  b  </pre>')
+
+        self.assertEqual(html, '<p>a b</p><pre>  a \n  b  </pre>')
+
+    def test_text_is_escaped(self):
+        html, text = clean_html('<p>1 &lt; 2 &amp; <b>x</b></p>')
+
+        self.assertEqual(html, '<p>1 &lt; 2 &amp; <b>x</b></p>')
+        self.assertEqual(text, '1 < 2 & x')
+
+
+class IsSafeURLTests(SimpleTestCase):
+
+    def test_schemes(self):
+        for url in ('https://example.com', 'http://example.com', '/plants/', '#top',
+                    'mailto:info@example.com', 'tel:+977'):
+            with self.subTest(url=url):
+                self.assertTrue(is_safe_url(url))
+
+        for url in ('javascript:alert(1)', 'java\tscript:alert(1)', 'java\nscript:alert(1)',
+                    '\x00javascript:alert(1)', 'data:text/html,<script>', 'vbscript:msgbox'):
+            with self.subTest(url=url):
+                self.assertFalse(is_safe_url(url))
+
+
+class MakeExcerptTests(SimpleTestCase):
+
+    def test_short_text_is_kept(self):
+        self.assertEqual(make_excerpt('A  medicinal\ntree', length=20), 'A medicinal tree')
+
+    def test_long_text_is_cut_on_a_word_boundary(self):
+        self.assertEqual(make_excerpt('The bark of the neem tree', length=15), 'The bark of…')
+        self.assertEqual(make_excerpt('The bark of the neem tree', length=16), 'The bark of the…')
+
+    def test_long_single_word_is_cut(self):
+        self.assertEqual(make_excerpt('Azadirachta', length=5), 'Azad…')
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+
+
+class FileTooLarge(RequestDataTooBig, MultiPartParserError):
+    """
+    An uploaded file exceeded its size limit. Django answers it with a 400 response, and
+    DRF's multipart parser turns it into a `ParseError`, also a 400.
+    """
+
+
+def get_max_size(field_name):
+    """
+    Return the maximum size in bytes of a file uploaded in the form field `field_name`.
+    The prefix of formset fields is ignored, e.g. "images-0-image" is limited like "image".
+    """
+    name = field_name.rsplit('-', 1)[-1]
+    return settings.FILE_UPLOAD_FIELD_MAX_SIZES.get(name, settings.FILE_UPLOAD_DEFAULT_MAX_SIZE)
+
+
+class SizeLimitUploadHandler(FileUploadHandler):
+    """
+    Abort the upload as soon as a file crosses the size limit of its field, instead of
+    receiving it whole for the model validators to reject. Placed first among the upload
+    handlers, it passes the chunks on to the next ones untouched.
+    """
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None,
+                 content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset,
+                         content_type_extra)
+        self.max_size = get_max_size(field_name)
+        self.received = 0
+        # The part may declare its length, in which case it is refused before any read.
+        if content_length is not None:
+            self.check_size(content_length)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        self.check_size(self.received)
+        return raw_data
+
+    def check_size(self, size):
+        # Like `ImageValidator`, the limit itself is too large.
+        if size >= self.max_size:
+            raise FileTooLarge(
+                f'{self.field_name}: the file must be less than {self.max_size / 1024:g} kB.')
+
+    def file_complete(self, file_size):
+        return None
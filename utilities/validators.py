@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.utils.deconstruct import deconstructible
 from django.core.exceptions import ValidationError
 
+from .duplicates import find_similar_images
+from .images import hash_image, probe_image
+
 
 @deconstructible
 class ImageValidator:
@@ -15,6 +19,11 @@ class ImageValidator:
         self.height = height
 
     def __call__(self, value):
+        # An image saved before was checked on upload, and reading its size or dimensions
+        # again would fetch it from the storage.
+        if getattr(value, '_committed', False):
+            return
+
         if self.size is not None and value.size >= self.size:
             raise ValidationError(
                 self.messages['size'],
@@ -24,11 +33,11 @@ class ImageValidator:
                 }
             )
 
-        width = value.image.width if hasattr(value, 'image') else value.width
-        height = value.image.height if hasattr(
-            value, 'image') else value.height
-        if (self.width is not None and self.height is not None
-                and (width != self.width or height != self.height)):
+        if self.width is None or self.height is None:
+            return
+
+        _, width, height = probe_image(value)
+        if width != self.width or height != self.height:
             raise ValidationError(
                 self.messages['dimensions'],
                 params={
@@ -45,3 +54,29 @@ class ImageValidator:
             and self.width == other.width
             and self.height == other.height
         )
+
+
+@deconstructible
+class UniqueImageValidator:
+    """
+    Reject new uploads that are copies of an image already stored, as told by their
+    perceptual hashes, when the REJECT_DUPLICATE_IMAGES setting is on.
+    """
+    message = 'This image was already uploaded (%(duplicate)s).'
+
+    def __call__(self, value):
+        # Only uploads are checked, an image saved before matches itself.
+        if not settings.REJECT_DUPLICATE_IMAGES or getattr(value, '_committed', False):
+            return
+
+        duplicates = find_similar_images(hash_image(value), settings.IMAGE_DUPLICATE_DISTANCE)
+        if duplicates:
+            model, pk, _ = duplicates[0]
+            raise ValidationError(
+                self.message,
+                code='duplicate',
+                params={'duplicate': f'{model._meta.verbose_name} {pk}', 'value': value},
+            )
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__)